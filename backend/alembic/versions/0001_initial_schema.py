@@ -0,0 +1,81 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 16:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The tables as Base.metadata.create_all used to build them; databases
+    # created that way are stamped at this revision by init_db
+    op.create_table(
+        "users",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=True),
+        sa.Column("gender", sa.Enum("male", "female", "other", name="gender_enum"), nullable=True),
+        sa.Column("birth_date", sa.DateTime(), nullable=True),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("user_id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_index("ix_users_user_id", "users", ["user_id"])
+
+    op.create_table(
+        "transcripts",
+        sa.Column("transcript_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("video_url", sa.Text(), nullable=False),
+        sa.Column("transcript_text", sa.Text(), nullable=True),
+        sa.Column("language", sa.String(50), nullable=True),
+        sa.Column("duration", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("transcript_id"),
+    )
+    op.create_index("ix_transcripts_transcript_id", "transcripts", ["transcript_id"])
+    op.create_index("ix_transcripts_video_url", "transcripts", ["video_url"], unique=True)
+
+    op.create_table(
+        "chats",
+        sa.Column("chat_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("transcript_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.ForeignKeyConstraint(["transcript_id"], ["transcripts.transcript_id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.user_id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("chat_id"),
+    )
+    op.create_index("ix_chats_chat_id", "chats", ["chat_id"])
+
+    op.create_table(
+        "messages",
+        sa.Column("message_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("chat_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("sender", sa.String(50), nullable=False),
+        sa.Column("message_text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.CheckConstraint("sender IN ('user', 'system', 'llm')", name="check_sender_valid"),
+        sa.ForeignKeyConstraint(["chat_id"], ["chats.chat_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("message_id"),
+    )
+    op.create_index("ix_messages_message_id", "messages", ["message_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("messages")
+    op.drop_table("chats")
+    op.drop_table("transcripts")
+    op.drop_table("users")
+    sa.Enum(name="gender_enum").drop(op.get_bind())
@@ -0,0 +1,217 @@
+"""chat summaries, transcript video ids, chunks, segments and jobs
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 16:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from urllib.parse import parse_qs, urlsplit
+import logging
+import re
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Frozen copy of the URL parsing as of this revision, so later changes to
+# app.services.youtube never change what this migration does
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+VIDEO_PATH_PATTERN = re.compile(r"^/(?:embed|v|e|shorts|live)/([^/?#&]+)")
+YOUTUBE_HOSTS = frozenset({"youtube.com", "youtube-nocookie.com"})
+HOST_PREFIXES = ("www.", "m.", "music.")
+
+
+def _columns(inspector, table):
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def _extract_video_id(url: str):
+    url = url.strip()
+    if VIDEO_ID_PATTERN.match(url):
+        return url
+
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = (parts.hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    candidate = None
+    if host == "youtu.be":
+        candidate = parts.path.lstrip("/").split("/")[0]
+    elif host in YOUTUBE_HOSTS:
+        if parts.path in ("/watch", "/watch/"):
+            candidate = parse_qs(parts.query).get("v", [None])[0]
+        else:
+            match = VIDEO_PATH_PATTERN.match(parts.path)
+            if match:
+                candidate = match.group(1)
+
+    if candidate and VIDEO_ID_PATTERN.match(candidate):
+        return candidate
+    return None
+
+
+def upgrade() -> None:
+    # Unversioned databases may already have some of this from create_all
+    # or the old init_db backfills, so every step checks first
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = set(inspector.get_table_names())
+
+    chat_columns = _columns(inspector, "chats")
+    if "summary" not in chat_columns:
+        op.add_column("chats", sa.Column("summary", sa.Text(), nullable=True))
+    if "summarized_until" not in chat_columns:
+        op.add_column("chats", sa.Column("summarized_until", sa.DateTime(timezone=True), nullable=True))
+
+    transcript_columns = _columns(inspector, "transcripts")
+    if "video_id" not in transcript_columns:
+        op.add_column("transcripts", sa.Column("video_id", sa.String(16), nullable=True))
+        # video_url is no longer unique: one video can have several languages
+        op.drop_index("ix_transcripts_video_url", table_name="transcripts")
+        op.create_index("ix_transcripts_video_url", "transcripts", ["video_url"])
+        _backfill_video_ids(conn)
+
+    # Checked on its own: the column may exist without the key that every
+    # ON CONFLICT upsert relies on
+    transcript_indexes = {index["name"] for index in inspector.get_indexes("transcripts")}
+    if "ix_transcripts_video_id_language" not in transcript_indexes:
+        _merge_duplicate_transcripts(conn)
+        op.create_index(
+            "ix_transcripts_video_id_language", "transcripts", ["video_id", "language"], unique=True)
+
+    if "text_length" not in transcript_columns:
+        op.add_column("transcripts", sa.Column("text_length", sa.Integer(), nullable=True))
+        op.execute("UPDATE transcripts SET text_length = length(transcript_text)")
+
+    if "transcript_chunks" not in tables:
+        op.create_table(
+            "transcript_chunks",
+            sa.Column("chunk_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("transcript_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("chunk_index", sa.Integer(), nullable=False),
+            sa.Column("start_time", sa.Float(), nullable=True),
+            sa.Column("end_time", sa.Float(), nullable=True),
+            sa.Column("chunk_text", sa.Text(), nullable=False),
+            sa.ForeignKeyConstraint(["transcript_id"], ["transcripts.transcript_id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("chunk_id"),
+        )
+        op.create_index(
+            "ix_transcript_chunks_transcript_id_chunk_index",
+            "transcript_chunks",
+            ["transcript_id", "chunk_index"],
+            unique=True,
+        )
+
+    if "transcript_segments" not in tables:
+        op.create_table(
+            "transcript_segments",
+            sa.Column("transcript_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("segment_index", sa.Integer(), nullable=False),
+            sa.Column("start_time", sa.Float(), nullable=False),
+            sa.Column("duration", sa.Float(), nullable=False),
+            sa.Column("text", sa.Text(), nullable=False),
+            sa.ForeignKeyConstraint(["transcript_id"], ["transcripts.transcript_id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("transcript_id", "segment_index"),
+        )
+        op.create_index(
+            "ix_transcript_segments_transcript_id_start_time",
+            "transcript_segments",
+            ["transcript_id", "start_time"],
+        )
+
+    if "transcript_jobs" not in tables:
+        op.create_table(
+            "transcript_jobs",
+            sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("video_id", sa.String(16), nullable=False),
+            sa.Column("language", sa.String(50), nullable=False),
+            sa.Column("status", sa.String(20), server_default="queued", nullable=False),
+            sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+            sa.Column("max_attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("transcript_id", postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column("requested_by", postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column("run_after", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.CheckConstraint(
+                "status IN ('queued', 'running', 'succeeded', 'failed')", name="check_job_status_valid"),
+            sa.ForeignKeyConstraint(["transcript_id"], ["transcripts.transcript_id"], ondelete="SET NULL"),
+            sa.ForeignKeyConstraint(["requested_by"], ["users.user_id"], ondelete="SET NULL"),
+            sa.PrimaryKeyConstraint("job_id"),
+        )
+        op.create_index(
+            "ix_transcript_jobs_active_video",
+            "transcript_jobs",
+            ["video_id", "language"],
+            unique=True,
+            postgresql_where=sa.text("status IN ('queued', 'running')"),
+        )
+        op.create_index("ix_transcript_jobs_status_run_after", "transcript_jobs", ["status", "run_after"])
+
+
+def _backfill_video_ids(conn) -> None:
+    rows = conn.execute(sa.text("SELECT transcript_id, video_url FROM transcripts")).all()
+    for transcript_id, video_url in rows:
+        video_id = _extract_video_id(video_url)
+        if video_id is None:
+            logger.warning(f"Could not parse video ID for transcript {transcript_id}: {video_url}")
+            continue
+        conn.execute(
+            sa.text("UPDATE transcripts SET video_id = :video_id WHERE transcript_id = :transcript_id"),
+            {"video_id": video_id, "transcript_id": transcript_id}
+        )
+    logger.info(f"Backfilled video IDs for {len(rows)} transcripts")
+
+
+def _merge_duplicate_transcripts(conn) -> None:
+
+    # Rows for the same video fetched under different URLs are merged into
+    # the oldest one; their chats are moved over before the rest are deleted
+    conn.execute(sa.text("""
+        CREATE TEMPORARY TABLE transcript_duplicates AS
+        SELECT transcript_id, keep_id FROM (
+            SELECT transcript_id,
+                   first_value(transcript_id) OVER (
+                       PARTITION BY video_id, language ORDER BY created_at, transcript_id
+                   ) AS keep_id
+            FROM transcripts
+            WHERE video_id IS NOT NULL
+        ) ranked
+        WHERE transcript_id <> keep_id
+    """))
+    conn.execute(sa.text("""
+        UPDATE chats SET transcript_id = d.keep_id
+        FROM transcript_duplicates d WHERE chats.transcript_id = d.transcript_id
+    """))
+    merged = conn.execute(sa.text("""
+        DELETE FROM transcripts USING transcript_duplicates d
+        WHERE transcripts.transcript_id = d.transcript_id
+    """)).rowcount
+    conn.execute(sa.text("DROP TABLE transcript_duplicates"))
+
+    logger.info(f"Merged {merged} duplicate transcripts")
+
+
+def downgrade() -> None:
+    op.drop_table("transcript_jobs")
+    op.drop_table("transcript_segments")
+    op.drop_table("transcript_chunks")
+    op.drop_column("transcripts", "text_length")
+    op.drop_index("ix_transcripts_video_id_language", table_name="transcripts")
+    op.drop_index("ix_transcripts_video_url", table_name="transcripts")
+    op.create_index("ix_transcripts_video_url", "transcripts", ["video_url"], unique=True)
+    op.drop_column("transcripts", "video_id")
+    op.drop_column("chats", "summarized_until")
+    op.drop_column("chats", "summary")
@@ -0,0 +1,49 @@
+"""hot-path indexes for chat, message and transcript reads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 16:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns); the trailing created_at/primary key columns let
+# keyset pages read straight off the index in order
+INDEXES = [
+    ("ix_messages_chat_id_created_at", "messages", ["chat_id", "created_at", "message_id"]),
+    ("ix_chats_user_id_created_at", "chats", ["user_id", "created_at", "chat_id"]),
+    ("ix_chats_transcript_id_user_id", "chats", ["transcript_id", "user_id", "created_at", "chat_id"]),
+    ("ix_transcripts_created_at", "transcripts", ["created_at", "transcript_id"]),
+]
+
+
+def _drop_if_invalid(name: str) -> None:
+    # An interrupted CREATE INDEX CONCURRENTLY leaves an invalid index
+    # behind that IF NOT EXISTS would otherwise keep forever
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    # Built without locking out writes, so this can run against a live
+    # database; CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            _drop_if_invalid(name)
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,203 @@
+"""usage counter columns maintained by triggers
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 17:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# Statement-level triggers with transition tables: a multi-row insert or a
+# cascade delete adjusts each counter once per statement, not once per row.
+# messages only touch chats.message_count; the chats trigger then carries
+# every change (new, deleted or re-parented chats and message count deltas)
+# on to users and transcripts.
+MESSAGE_COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION messages_count_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE chats c SET message_count = c.message_count + d.n
+        FROM (SELECT chat_id, count(*) AS n FROM new_rows GROUP BY chat_id) d
+        WHERE c.chat_id = d.chat_id;
+    ELSE
+        UPDATE chats c SET message_count = c.message_count - d.n
+        FROM (SELECT chat_id, count(*) AS n FROM old_rows GROUP BY chat_id) d
+        WHERE c.chat_id = d.chat_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# (user_id, transcript_id, chats, messages) changes for each trigger event
+CHAT_DELTAS = {
+    "INSERT": "SELECT user_id, transcript_id, 1 AS chats, message_count AS messages FROM new_rows",
+    "DELETE": "SELECT user_id, transcript_id, -1 AS chats, -message_count AS messages FROM old_rows",
+    "UPDATE": (
+        "SELECT user_id, transcript_id, -1 AS chats, -message_count AS messages FROM old_rows "
+        "UNION ALL SELECT user_id, transcript_id, 1, message_count FROM new_rows"
+    ),
+}
+
+
+def _apply_chat_deltas(deltas: str) -> str:
+    # Summary-only updates net out to zero and write nothing
+    return f"""
+        UPDATE users u SET chat_count = u.chat_count + d.chats, message_count = u.message_count + d.messages
+        FROM (
+            SELECT user_id, sum(chats) AS chats, sum(messages) AS messages
+            FROM ({deltas}) x WHERE user_id IS NOT NULL GROUP BY user_id
+            HAVING sum(chats) <> 0 OR sum(messages) <> 0
+        ) d
+        WHERE u.user_id = d.user_id;
+
+        UPDATE transcripts t SET chat_count = t.chat_count + d.chats
+        FROM (
+            SELECT transcript_id, sum(chats) AS chats
+            FROM ({deltas}) x WHERE transcript_id IS NOT NULL GROUP BY transcript_id
+            HAVING sum(chats) <> 0
+        ) d
+        WHERE t.transcript_id = d.transcript_id;
+    """
+
+
+CHAT_COUNT_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION chats_count_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_apply_chat_deltas(CHAT_DELTAS["INSERT"])}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_apply_chat_deltas(CHAT_DELTAS["DELETE"])}
+    ELSE
+        {_apply_chat_deltas(CHAT_DELTAS["UPDATE"])}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = [
+    ("messages_count_insert", "messages", "INSERT", "NEW TABLE AS new_rows", "messages_count_changed"),
+    ("messages_count_delete", "messages", "DELETE", "OLD TABLE AS old_rows", "messages_count_changed"),
+    ("chats_count_insert", "chats", "INSERT", "NEW TABLE AS new_rows", "chats_count_changed"),
+    ("chats_count_update", "chats", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows", "chats_count_changed"),
+    ("chats_count_delete", "chats", "DELETE", "OLD TABLE AS old_rows", "chats_count_changed"),
+]
+
+COUNTER_COLUMNS = [
+    ("chats", "message_count"),
+    ("users", "chat_count"),
+    ("users", "message_count"),
+    ("transcripts", "chat_count"),
+]
+
+# (table, key, assignments) recomputed from scratch by the backfill. chats
+# come first: the user totals sum chats.message_count
+BACKFILLS = [
+    ("chats", "chat_id",
+     "message_count = (SELECT count(*) FROM messages m WHERE m.chat_id = t.chat_id)"),
+    ("users", "user_id",
+     "chat_count = (SELECT count(*) FROM chats c WHERE c.user_id = t.user_id), "
+     "message_count = (SELECT coalesce(sum(c.message_count), 0) FROM chats c WHERE c.user_id = t.user_id)"),
+    ("transcripts", "transcript_id",
+     "chat_count = (SELECT count(*) FROM chats c WHERE c.transcript_id = t.transcript_id)"),
+]
+BACKFILL_BATCH_SIZE = 1000
+# Keys are random UUIDs, so the nil UUID sorts before every row
+BACKFILL_START = "00000000-0000-0000-0000-000000000000"
+DEADLOCK_RETRIES = 5
+
+
+def _backfill_function(table: str, key: str, assignments: str) -> str:
+    # One call is one transaction over the next batch of parent rows. They
+    # are locked first and counted in a later statement, which takes a new
+    # snapshot: every write that held one of these rows has committed by
+    # then, and every later one waits for the lock and applies its trigger
+    # delta on top of the recomputed value. Other rows stay writable
+    return f"""
+CREATE OR REPLACE FUNCTION usage_counters_backfill_{table}(after uuid, batch_size int) RETURNS uuid AS $$
+DECLARE
+    ids uuid[];
+BEGIN
+    SELECT array_agg({key} ORDER BY {key}) INTO ids FROM (
+        SELECT {key} FROM {table}
+        WHERE {key} > after
+        ORDER BY {key}
+        LIMIT batch_size
+        FOR UPDATE
+    ) batch;
+    IF ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    UPDATE {table} t SET {assignments} WHERE t.{key} = ANY(ids);
+    RETURN ids[array_length(ids, 1)];
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _run_backfill(table: str) -> None:
+    call = f"SELECT usage_counters_backfill_{table}(CAST(:after AS uuid), :batch_size)"
+    if op.get_context().as_sql:
+        # Offline scripts cannot loop on results, so the table goes in one call
+        op.execute(f"SELECT usage_counters_backfill_{table}('{BACKFILL_START}', NULL)")
+        return
+
+    bind = op.get_bind()
+    after = BACKFILL_START
+    while True:
+        for attempt in range(1, DEADLOCK_RETRIES + 1):
+            try:
+                after = bind.execute(sa.text(call), {"after": after, "batch_size": BACKFILL_BATCH_SIZE}).scalar()
+                break
+            except sa.exc.DBAPIError as e:
+                # A multi-chat write can lock rows in another order; the batch
+                # is rolled back and simply runs again
+                if getattr(e.orig, "pgcode", None) != "40P01" or attempt == DEADLOCK_RETRIES:
+                    raise
+        if after is None:
+            return
+
+
+def upgrade() -> None:
+    # Column defaults and triggers only change the catalog, so the locks
+    # they need are brief. From here on every write keeps the counters
+    # moving; the backfill only has to correct their starting values
+    for table, column in COUNTER_COLUMNS:
+        op.add_column(table, sa.Column(column, sa.Integer(), server_default="0", nullable=False))
+
+    op.execute(MESSAGE_COUNT_FUNCTION)
+    op.execute(CHAT_COUNT_FUNCTION)
+    for name, table, event, referencing, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+            f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+    for table, key, assignments in BACKFILLS:
+        op.execute(_backfill_function(table, key, assignments))
+
+    # Batches commit one at a time, so the live database is never locked
+    # beyond the parent rows of the batch in progress
+    with op.get_context().autocommit_block():
+        for table, _, _ in BACKFILLS:
+            _run_backfill(table)
+            op.execute(f"DROP FUNCTION usage_counters_backfill_{table}(uuid, int)")
+
+
+def downgrade() -> None:
+    for table, _, _ in BACKFILLS:
+        op.execute(f"DROP FUNCTION IF EXISTS usage_counters_backfill_{table}(uuid, int)")
+    for name, table, _, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS chats_count_changed()")
+    op.execute("DROP FUNCTION IF EXISTS messages_count_changed()")
+
+    for table, column in COUNTER_COLUMNS:
+        op.drop_column(table, column)
@@ -0,0 +1,26 @@
+"""message timestamps from clock_timestamp()
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 18:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# now() is fixed for a whole transaction, so a question and its answer
+# written together would tie on created_at and be ordered by their random
+# message_id. clock_timestamp() keeps them in insertion order.
+
+
+def upgrade() -> None:
+    op.alter_column("messages", "created_at", server_default=sa.text("clock_timestamp()"))
+
+
+def downgrade() -> None:
+    op.alter_column("messages", "created_at", server_default=sa.text("now()"))
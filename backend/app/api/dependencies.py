@@ -0,0 +1,75 @@
+from typing import AsyncIterator
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.security import decode_token
+from app.schemas.user import UserResponse
+from app.services.auth_cache import auth_cache
+from app.services.user import user_service
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> UserResponse:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    user_id = auth_cache.get_token_subject(token)
+    if user_id is None:
+        payload = decode_token(token)
+        if payload is None:
+            raise credentials_exception
+
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise credentials_exception
+        auth_cache.set_token_subject(token, user_id, payload.get("exp"))
+
+    try:
+        user_id = UUID(user_id)
+    except ValueError:
+        raise credentials_exception
+
+    # The session only takes a connection once it is used, so a cache hit
+    # costs no database round trip at all
+    cached_user = auth_cache.get_user(user_id)
+    if cached_user is not None:
+        return cached_user
+
+    try:
+        user = await user_service.get_by_id(db, user_id)
+    except Exception:
+        raise credentials_exception
+
+    if user is None:
+        raise credentials_exception
+
+    current_user = UserResponse.model_validate(user)
+    auth_cache.set_user(current_user)
+    return current_user
+
+
+async def get_current_admin(
+    current_user: UserResponse = Depends(get_current_user)
+) -> UserResponse:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.api.dependencies import get_current_admin, get_db
+from app.schemas.admin import CacheStatsResponse, LLMUsageStatsResponse, MessageQueueStatsResponse, SemanticCachePurgeResponse, UsageStatsResponse
+from app.schemas.user import UserResponse
+from app.services.auth_cache import auth_cache
+from app.services.llm import llm_service
+from app.services.message_writer import message_writer
+from app.services.stats import usage_stats_service
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/auth/cache", response_model=CacheStatsResponse)
+async def get_auth_cache_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    return CacheStatsResponse(**auth_cache.stats())
+
+
+@router.delete("/auth/cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_auth_cache(current_admin: UserResponse = Depends(get_current_admin)):
+    auth_cache.clear()
+
+
+@router.get("/messages/queue", response_model=MessageQueueStatsResponse)
+async def get_message_queue_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    return MessageQueueStatsResponse(**message_writer.stats())
+
+
+@router.get("/llm/cache", response_model=CacheStatsResponse)
+async def get_llm_cache_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    return CacheStatsResponse(**await llm_service.response_cache.stats())
+
+
+@router.delete("/llm/cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_llm_cache(current_admin: UserResponse = Depends(get_current_admin)):
+    await llm_service.response_cache.clear()
+
+
+@router.get("/llm/semantic-cache", response_model=CacheStatsResponse)
+async def get_semantic_cache_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    return CacheStatsResponse(**llm_service.semantic_cache.stats())
+
+
+@router.delete("/llm/semantic-cache/{transcript_id}", response_model=SemanticCachePurgeResponse)
+async def purge_semantic_cache(
+    transcript_id: UUID,
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    removed = llm_service.semantic_cache.purge(transcript_id)
+    return SemanticCachePurgeResponse(transcript_id=transcript_id, removed_entries=removed)
+
+
+@router.get("/stats", response_model=UsageStatsResponse)
+async def get_usage_stats(
+    top: int = Query(10, ge=0, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_admin: UserResponse = Depends(get_current_admin)
+):
+    totals = await usage_stats_service.get_totals(db)
+    top_transcripts = await usage_stats_service.get_top_transcripts(db, limit=top) if top else []
+    return UsageStatsResponse(**totals, top_transcripts=top_transcripts)
+
+
+@router.get("/llm/usage", response_model=LLMUsageStatsResponse)
+async def get_llm_usage_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    return LLMUsageStatsResponse(providers=llm_service.usage_stats.stats())
@@ -1,35 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
-
-from app.core.database import SessionLocal
-from app.schemas.chat import ChatCreate, ChatResponse, MessageCreate, MessageResponse, LLMRequestSchema, LLMResponseSchema
+import anyio
+import json
+import logging
+
+from app.api.dependencies import get_current_user, get_db
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.schemas.chat import ChatCreate, ChatResponse, ChatSummaryResponse, MessageCreate, MessageResponse, LLMRequestSchema, LLMResponseSchema
+from app.schemas.pagination import Page
 from app.schemas.user import UserResponse
 from app.services.chat import chat_service
-from app.services.llm_service import llm_service
-from app.api.routes.user import get_current_user
+from app.services.llm import llm_service
+from app.services.llm.context import ContextWindow
+from app.services.llm.semantic_cache import SemanticScope
+from app.services.llm.usage import LLMUsage
+from app.services.summary import chat_summary_service
+from app.services.transcript_index import format_timestamp
+from app.services.youtube import transcript_service
 
 router = APIRouter(prefix="/api/chats", tags=["chats"])
+logger = logging.getLogger(__name__)
 
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+SYSTEM_PROMPT = "You are a helpful AI assistant that helps users understand and discuss content from YouTube videos. Be concise, informative, and friendly."
 
 
 @router.post("/", response_model=ChatResponse, status_code=status.HTTP_201_CREATED)
-def create_chat(
+async def create_chat(
     chat_data: ChatCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
 
     try:
-        chat = chat_service.create_chat(
+        chat = await chat_service.create_chat(
             db,
             user_id=current_user.user_id,
             transcript_id=chat_data.transcript_id
@@ -47,14 +54,27 @@ def create_chat(
         )
 
 
-@router.get("/", response_model=List[ChatResponse])
-def get_user_chats(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[ChatSummaryResponse])
+async def get_user_chats(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    include_messages: bool = False,
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        chats = chat_service.get_by_user_id(db, current_user.user_id)
-        return [ChatResponse.model_validate(chat) for chat in chats]
+        page = await chat_service.get_by_user_id(
+            db, current_user.user_id, cursor=cursor, limit=limit, include_messages=include_messages)
+        return Page(
+            items=[ChatSummaryResponse.model_validate(chat) for chat in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -63,49 +83,44 @@ def get_user_chats(
 
 
 @router.get("/{chat_id}", response_model=ChatResponse)
-def get_chat(
+async def get_chat(
     chat_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    if not chat_service.chat_belongs_to_user(db, chat_id, current_user.user_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this chat"
-        )
-
-    chat = chat_service.get_chat_with_messages(db, chat_id)
+    chat = await chat_service.get_user_chat(db, chat_id, current_user.user_id)
 
     if not chat:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Chat not found"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this chat"
         )
 
-    return ChatResponse.model_validate(chat)
+    # The latest messages only; older history is paged via /messages?before=
+    messages = await chat_service.get_recent_messages(db, chat_id, settings.CHAT_RECENT_MESSAGES)
+    return ChatResponse(
+        chat_id=chat.chat_id,
+        transcript_id=chat.transcript_id,
+        created_at=chat.created_at,
+        messages=[MessageResponse.model_validate(msg) for msg in messages]
+    )
 
 
 @router.post("/{chat_id}/messages", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-def add_message(
+async def add_message(
     chat_id: UUID,
     message_data: MessageCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    if not chat_service.chat_belongs_to_user(db, chat_id, current_user.user_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this chat"
-        )
-
     try:
-        message = chat_service.add_message(
+        message = await chat_service.add_message_for_user(
             db,
             chat_id=chat_id,
+            user_id=current_user.user_id,
             sender=message_data.sender,
             message_text=message_data.message_text
         )
-        return MessageResponse.model_validate(message)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -117,67 +132,128 @@ def add_message(
             detail="An error occurred while adding message"
         )
 
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this chat"
+        )
+
+    return MessageResponse.model_validate(message)
+
 
-@router.get("/{chat_id}/messages", response_model=List[MessageResponse])
-def get_chat_messages(
+@router.get("/{chat_id}/messages", response_model=Page[MessageResponse])
+async def get_chat_messages(
     chat_id: UUID,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    before: Optional[UUID] = None,
+    after: Optional[UUID] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    if not chat_service.chat_belongs_to_user(db, chat_id, current_user.user_id):
+    if not await chat_service.chat_belongs_to_user(db, chat_id, current_user.user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this chat"
         )
 
-    chat = chat_service.get_chat_with_messages(db, chat_id)
+    if sum(value is not None for value in (cursor, before, after)) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only one of cursor, before and after can be given"
+        )
 
-    if not chat:
+    try:
+        page = await chat_service.get_messages(
+            db, chat_id, cursor=cursor, limit=limit, before=before, after=after)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Chat not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
 
-    return [MessageResponse.model_validate(msg) for msg in chat.messages]
+    return Page(
+        items=[MessageResponse.model_validate(msg) for msg in page.items],
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor
+    )
 
 
-@router.delete("/{chat_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_chat(
+@router.get("/{chat_id}/messages/since/{message_id}", response_model=Page[MessageResponse])
+async def get_chat_messages_since(
     chat_id: UUID,
-    db: Session = Depends(get_db),
+    message_id: UUID,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    if not chat_service.chat_belongs_to_user(db, chat_id, current_user.user_id):
+    # Incremental sync: everything newer than the last message a client has,
+    # continued through next_cursor when there is more than one page
+    if not await chat_service.chat_belongs_to_user(db, chat_id, current_user.user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this chat"
         )
 
     try:
-        result = chat_service.delete_chat_with_messages(db, chat_id)
-        if not result:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Chat not found"
-            )
+        page = await chat_service.get_messages(db, chat_id, limit=limit, after=message_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return Page(
+        items=[MessageResponse.model_validate(msg) for msg in page.items],
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor
+    )
+
+
+@router.delete("/{chat_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_chat(
+    chat_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    try:
+        deleted = await chat_service.delete_user_chat(db, chat_id, current_user.user_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while deleting chat"
         )
 
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this chat"
+        )
+
 
-@router.get("/transcript/{transcript_id}", response_model=List[ChatResponse])
-def get_chats_by_transcript(
+@router.get("/transcript/{transcript_id}", response_model=Page[ChatSummaryResponse])
+async def get_chats_by_transcript(
     transcript_id: UUID,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    include_messages: bool = False,
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        chats = chat_service.get_chats_by_transcript(db, transcript_id)
-        user_chats = [chat for chat in chats if chat.user_id ==
-                      current_user.user_id]
-        return [ChatResponse.model_validate(chat) for chat in user_chats]
+        page = await chat_service.get_chats_by_transcript(
+            db, transcript_id, user_id=current_user.user_id, cursor=cursor, limit=limit,
+            include_messages=include_messages)
+        return Page(
+            items=[ChatSummaryResponse.model_validate(chat) for chat in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -185,58 +261,191 @@ def get_chats_by_transcript(
         )
 
 
+def _format_transcript_context(chunks: List[Dict[str, Any]]) -> Optional[str]:
+    if not chunks:
+        return None
+
+    excerpts = "\n\n".join(
+        f"[{format_timestamp(chunk['start'])} - {format_timestamp(chunk['end'])}] {chunk['text']}"
+        if chunk['start'] is not None else chunk['text']
+        for chunk in chunks
+    )
+    return f"Relevant excerpts from the video transcript:\n\n{excerpts}"
+
+
+async def _build_context_window(db: AsyncSession, chat, history: List, user_message: str, provider: str) -> ContextWindow:
+    context = None
+    if chat.transcript_id:
+        chunks = await transcript_service.search_chunks(db, chat.transcript_id, user_message)
+        context = _format_transcript_context(chunks)
+
+    summary, recent_messages = chat_summary_service.split_history(chat, history)
+
+    return llm_service.build_context_window(
+        provider=provider,
+        chat_messages=recent_messages,
+        new_user_message=user_message,
+        system_prompt=SYSTEM_PROMPT,
+        context=context,
+        summary=summary
+    )
+
+
+def _schedule_summary_update(background_tasks: BackgroundTasks, chat, history: List, provider: str) -> None:
+    _, recent_messages = chat_summary_service.split_history(chat, history)
+    # The user and llm messages written by this request are not in history
+    if chat_summary_service.needs_update(len(recent_messages) + 2):
+        background_tasks.add_task(
+            chat_summary_service.update_summary, chat.chat_id, provider)
+
+
+def _semantic_cache_scope(chat, history: List, request: LLMRequestSchema) -> Optional[SemanticScope]:
+    # Only opening questions are shared between chats; later answers depend
+    # on the conversation that came before them. Answers never cross
+    # providers or models
+    is_opening = not history and chat.summarized_until is None
+    if settings.SEMANTIC_CACHE_ENABLED and request.use_cache and chat.transcript_id and is_opening:
+        llm = llm_service.get_llm(request.provider)
+        return chat.transcript_id, llm.provider.value, llm.model
+    return None
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _save_llm_reply(chat_id: UUID, user_message: str, reply_text: str):
+    # The request session may already be closed once the stream is running
+    async with AsyncSessionLocal() as db:
+        _, message = await chat_service.add_exchange(
+            db,
+            chat_id=chat_id,
+            user_message=user_message,
+            llm_message=reply_text
+        )
+        return message
+
+
+async def _replay_answer(answer: str) -> AsyncIterator[str]:
+    yield answer
+
+
+async def _stream_llm_reply(
+    chat_id: UUID,
+    request: LLMRequestSchema,
+    window: Optional[ContextWindow],
+    semantic_scope: Optional[SemanticScope] = None,
+    cached_answer: Optional[str] = None
+) -> AsyncIterator[str]:
+    parts = []
+    completed = False
+    message = None
+    usage = LLMUsage()
+
+    if cached_answer is not None:
+        deltas = _replay_answer(cached_answer)
+    else:
+        deltas = llm_service.stream_response(
+            provider=request.provider,
+            messages=window.messages,
+            use_cache=request.use_cache,
+            usage=usage
+        )
+
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield _sse_event("delta", {"delta": delta})
+        completed = True
+
+        if semantic_scope and cached_answer is None:
+            llm_service.semantic_cache.add(semantic_scope, request.user_message, "".join(parts))
+    except ValueError as e:
+        yield _sse_event("error", {"detail": str(e)})
+    finally:
+        reply_text = "".join(parts)
+        if reply_text.strip():
+            if not completed:
+                logger.info(
+                    f"LLM stream for chat {chat_id} ended early, saving partial reply")
+            # Shielded so a client disconnect does not cancel the write
+            with anyio.CancelScope(shield=True):
+                try:
+                    message = await _save_llm_reply(chat_id, request.user_message, reply_text)
+                except Exception as e:
+                    logger.error(f"Failed to save LLM reply for chat {chat_id}: {e}")
+
+    if message is not None:
+        yield _sse_event("done", {
+            "chat_id": str(chat_id),
+            "message_id": str(message.message_id),
+            "completed": completed,
+            "prompt_tokens": window.prompt_tokens if window else None,
+            "dropped_tokens": window.dropped_tokens if window else 0,
+            "usage": usage.to_dict() if usage.input_tokens else None
+        })
+
+
 @router.post("/{chat_id}/llm", response_model=LLMResponseSchema)
 async def send_message_to_llm(
     chat_id: UUID,
     request: LLMRequestSchema,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    if not chat_service.chat_belongs_to_user(db, chat_id, current_user.user_id):
+    chat = await chat_service.get_user_chat(db, chat_id, current_user.user_id)
+
+    if not chat:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this chat"
         )
 
     try:
-        chat = chat_service.get_chat_with_messages(db, chat_id)
-
-        if not chat:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Chat not found"
+        chat_service.validate_message("user", request.user_message)
+        history = await chat_service.get_chat_history(db, chat)
+
+        window = None
+        llm_response_text = None
+        usage = LLMUsage()
+        semantic_scope = _semantic_cache_scope(chat, history, request)
+        if semantic_scope:
+            llm_response_text = llm_service.semantic_cache.lookup(semantic_scope, request.user_message)
+
+        if llm_response_text is None:
+            window = await _build_context_window(db, chat, history, request.user_message, request.provider)
+            # Ends the read transaction so the connection goes back to the
+            # pool for the LLM call; loaded rows survive (expire_on_commit=False)
+            await db.commit()
+
+            llm_response_text = await llm_service.generate_response(
+                provider=request.provider,
+                messages=window.messages,
+                use_cache=request.use_cache,
+                usage=usage
             )
 
-        chat_service.add_message(
-            db,
-            chat_id=chat_id,
-            sender="user",
-            message_text=request.user_message
-        )
-
-        system_prompt = "You are a helpful AI assistant that helps users understand and discuss content from YouTube videos. Be concise, informative, and friendly."
-
-        messages = llm_service.format_chat_history(
-            chat_messages=chat.messages,
-            new_user_message=request.user_message,
-            system_prompt=system_prompt
-        )
-
-        llm_response_text = llm_service.generate_response(
-            provider=request.provider,
-            messages=messages
-        )
+            if semantic_scope:
+                llm_service.semantic_cache.add(semantic_scope, request.user_message, llm_response_text)
 
-        chat_service.add_message(
+        # The question is stored with its answer, in a short transaction
+        # of its own once the answer exists
+        await chat_service.add_exchange(
             db,
             chat_id=chat_id,
-            sender="llm",
-            message_text=llm_response_text
+            user_message=request.user_message,
+            llm_message=llm_response_text
         )
 
+        _schedule_summary_update(background_tasks, chat, history, request.provider)
+
         return LLMResponseSchema(
             chat_id=chat_id,
-            llm_message=llm_response_text
+            llm_message=llm_response_text,
+            prompt_tokens=window.prompt_tokens if window else None,
+            dropped_tokens=window.dropped_tokens if window else 0,
+            usage=usage.to_dict() if usage.input_tokens else None
         )
 
     except ValueError as e:
@@ -249,3 +458,50 @@ async def send_message_to_llm(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while processing LLM request: {str(e)}"
         )
+
+
+@router.post("/{chat_id}/llm/stream")
+async def stream_message_to_llm(
+    chat_id: UUID,
+    request: LLMRequestSchema,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    chat = await chat_service.get_user_chat(db, chat_id, current_user.user_id)
+
+    if not chat:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this chat"
+        )
+
+    history = await chat_service.get_chat_history(db, chat)
+
+    try:
+        llm_service.get_llm(request.provider)
+        chat_service.validate_message("user", request.user_message)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    window = None
+    cached_answer = None
+    semantic_scope = _semantic_cache_scope(chat, history, request)
+    if semantic_scope:
+        cached_answer = llm_service.semantic_cache.lookup(semantic_scope, request.user_message)
+
+    if cached_answer is None:
+        window = await _build_context_window(db, chat, history, request.user_message, request.provider)
+    _schedule_summary_update(background_tasks, chat, history, request.provider)
+    # The request session stays open until the stream ends, so its read
+    # transaction is ended here rather than held for the whole response
+    await db.commit()
+
+    return StreamingResponse(
+        _stream_llm_reply(chat_id, request, window, semantic_scope, cached_answer),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
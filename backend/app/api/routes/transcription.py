@@ -1,33 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from uuid import UUID
 
-from app.core.database import SessionLocal
-from app.schemas.transcript import TranscriptCreate, TranscriptResponse
+from app.api.dependencies import get_current_user, get_db
+from app.core.config import settings
+from app.schemas.transcript import (
+    TranscriptBatchCreate,
+    TranscriptBatchItem,
+    TranscriptBatchResponse,
+    TranscriptCreate,
+    TranscriptJobResponse,
+    TranscriptResponse,
+    TranscriptSegmentResponse,
+    TranscriptSegmentsResponse,
+    TranscriptSummaryResponse,
+)
+from app.schemas.pagination import Page
 from app.schemas.user import UserResponse
+from app.services.transcript_index import parse_timestamp
+from app.services.transcript_jobs import transcript_job_service
 from app.services.youtube import transcript_service
-from app.api.routes.user import get_current_user
 
 router = APIRouter(prefix="/api/transcripts", tags=["transcripts"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=TranscriptResponse, status_code=status.HTTP_201_CREATED)
-def create_transcript(
+async def create_transcript(
     transcript_data: TranscriptCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        transcript = transcript_service.get_transcript(db, transcript_data)
+        transcript = await transcript_service.get_transcript(db, transcript_data)
         return TranscriptResponse.model_validate(transcript)
     except ValueError as e:
         raise HTTPException(
@@ -41,13 +46,85 @@ def create_transcript(
         )
 
 
+@router.post("/batch", response_model=TranscriptBatchResponse)
+async def create_transcripts_batch(
+    batch_data: TranscriptBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    if not batch_data.video_urls and not batch_data.playlist_url:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide video_urls or a playlist_url"
+        )
+
+    try:
+        items = [TranscriptBatchItem(**item) for item in await transcript_service.ingest_batch(db, batch_data)]
+        return TranscriptBatchResponse(
+            items=items,
+            created=sum(item.status == "created" for item in items),
+            existing=sum(item.status == "existing" for item in items),
+            failed=sum(item.status in ("failed", "invalid") for item in items)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while fetching transcripts: {str(e)}"
+        )
+
+
+@router.post("/jobs", response_model=TranscriptJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_transcript_job(
+    transcript_data: TranscriptCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    try:
+        job = await transcript_job_service.enqueue(db, transcript_data, current_user.user_id)
+        return TranscriptJobResponse.model_validate(job)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while queueing transcript job: {str(e)}"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=TranscriptJobResponse)
+async def get_transcript_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    # Any signed-in user may poll a job: jobs are shared between everyone
+    # who asked for the same video and hold nothing private
+    job = await transcript_job_service.get_by_id(db, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcript job not found"
+        )
+
+    return TranscriptJobResponse.model_validate(job)
+
+
 @router.get("/{transcript_id}", response_model=TranscriptResponse)
-def get_transcript_by_id(
+async def get_transcript_by_id(
     transcript_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    transcript = transcript_service.get_by_id(db, transcript_id)
+    transcript = await transcript_service.get_by_id(db, transcript_id)
 
     if not transcript:
         raise HTTPException(
@@ -58,16 +135,59 @@ def get_transcript_by_id(
     return TranscriptResponse.model_validate(transcript)
 
 
-@router.get("/", response_model=List[TranscriptResponse])
-def get_all_transcripts(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+@router.get("/{transcript_id}/segments", response_model=TranscriptSegmentsResponse)
+async def get_transcript_segments(
+    transcript_id: UUID,
+    from_: Optional[str] = Query(None, alias="from"),
+    to: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    try:
+        start = parse_timestamp(from_) if from_ else 0.0
+        end = parse_timestamp(to) if to else None
+        segments = await transcript_service.get_segments(db, transcript_id, start, end, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if segments is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcript not found"
+        )
+
+    return TranscriptSegmentsResponse(
+        transcript_id=transcript_id,
+        start=start,
+        end=end,
+        segments=[TranscriptSegmentResponse.model_validate(segment) for segment in segments]
+    )
+
+
+@router.get("/", response_model=Page[TranscriptSummaryResponse])
+async def get_all_transcripts(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
+    # Listings never include the text; fetch a single transcript for that
     try:
-        transcripts = transcript_service.get_all(db, skip=skip, limit=limit)
-        return [TranscriptResponse.model_validate(t) for t in transcripts]
+        page = await transcript_service.get_summaries(db, cursor=cursor, limit=limit)
+        return Page(
+            items=[TranscriptSummaryResponse.model_validate(t) for t in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -76,13 +196,13 @@ def get_all_transcripts(
 
 
 @router.delete("/{transcript_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_transcript(
+async def delete_transcript(
     transcript_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        result = transcript_service.delete(db, transcript_id)
+        result = await transcript_service.delete(db, transcript_id)
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
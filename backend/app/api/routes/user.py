@@ -1,60 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from uuid import UUID
 
-from app.core.database import SessionLocal
-from app.core.security import create_access_token, decode_token
-from app.schemas.user import UserCreate, UserResponse
+from app.api.dependencies import get_current_user, get_db
+from app.core.security import create_access_token
+from app.schemas.user import UserCreate, UserResponse, UserStatsResponse
+from app.services.stats import usage_stats_service
 from app.services.user import user_service
 
 router = APIRouter(prefix="/api/users", tags=["users"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
-
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> UserResponse:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    payload = decode_token(token)
-    if payload is None:
-        raise credentials_exception
-
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-
-    try:
-        user = user_service.get_by_id(db, UUID(user_id))
-    except Exception:
-        raise credentials_exception
-
-    if user is None:
-        raise credentials_exception
-
-    return UserResponse.model_validate(user)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     print('register')
     try:
-        user = user_service.create_user(db, user_data)
+        user = await user_service.create_user(db, user_data)
         return UserResponse.model_validate(user)
     except ValueError as e:
         raise HTTPException(
@@ -69,11 +32,11 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = user_service.authenticate_user(
+    user = await user_service.authenticate_user(
         db, email=form_data.username, password=form_data.password)
 
     if not user:
@@ -93,17 +56,33 @@ def login(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_profile(current_user: UserResponse = Depends(get_current_user)):
+async def get_current_user_profile(current_user: UserResponse = Depends(get_current_user)):
     return current_user
 
 
+@router.get("/me/stats", response_model=UserStatsResponse)
+async def get_current_user_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    stats = await usage_stats_service.get_user_stats(db, current_user.user_id)
+
+    if not stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    return UserStatsResponse(**stats)
+
+
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user_by_id(
+async def get_user_by_id(
     user_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    user = user_service.get_by_id(db, user_id)
+    user = await user_service.get_by_id(db, user_id)
 
     if not user:
         raise HTTPException(
@@ -115,14 +94,14 @@ def get_user_by_id(
 
 
 @router.put("/me", response_model=UserResponse)
-def update_profile(
+async def update_profile(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
         update_dict = user_data.dict(exclude_unset=True)
-        updated_user = user_service.update_user_profile(
+        updated_user = await user_service.update_user_profile(
             db, current_user.user_id, **update_dict
         )
 
@@ -146,12 +125,12 @@ def update_profile(
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-def delete_profile(
-    db: Session = Depends(get_db),
+async def delete_profile(
+    db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        result = user_service.delete(db, current_user.user_id)
+        result = await user_service.delete(db, current_user.user_id)
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
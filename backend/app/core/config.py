@@ -19,19 +19,102 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    DB_POOL_SIZE: int = Field(default=20)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = Field(default=500)
+
     SECRET_KEY: str = Field(default="your-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
+    # bcrypt work factor; stored hashes with a different cost are
+    # re-hashed on the next successful login
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31)
+    PASSWORD_HASH_WORKERS: int = Field(default=4)
+    # Verified tokens and user snapshots are reused for this long; changes
+    # made through the API invalidate them on every worker right away
+    AUTH_CACHE_ENABLED: bool = Field(default=True)
+    AUTH_CACHE_MAX_ENTRIES: int = Field(default=10000)
+    AUTH_CACHE_TTL_SECONDS: float = Field(default=60.0)
+    AUTH_CACHE_RECONNECT_SECONDS: float = Field(default=5.0)
 
     OPENAI_API_KEY: Optional[str] = Field(default=None)
     ANTHROPIC_API_KEY: Optional[str] = Field(default=None)
 
     CORS_ORIGINS: list = ["*"]
+    GZIP_MINIMUM_SIZE: int = Field(default=1024)
+    PAGE_SIZE_DEFAULT: int = Field(default=50)
+    PAGE_SIZE_MAX: int = Field(default=200)
+
+    TRANSCRIPT_DEFAULT_LANGUAGE: str = Field(default="en")
+    TRANSCRIPT_BATCH_MAX_ITEMS: int = Field(default=200)
+    TRANSCRIPT_FETCH_CONCURRENCY: int = Field(default=8)
+    TRANSCRIPT_CHUNK_CHARS: int = Field(default=1000)
+
+    # In-process workers for POST /api/transcripts/jobs; 0 disables them
+    TRANSCRIPT_JOB_CONCURRENCY: int = Field(default=4)
+    TRANSCRIPT_JOB_MAX_ATTEMPTS: int = Field(default=5)
+    TRANSCRIPT_JOB_BACKOFF_SECONDS: float = Field(default=2.0)
+    TRANSCRIPT_JOB_BACKOFF_MAX_SECONDS: float = Field(default=300.0)
+    TRANSCRIPT_JOB_POLL_SECONDS: float = Field(default=2.0)
+    # A running job not finished within this time is picked up again
+    TRANSCRIPT_JOB_LEASE_SECONDS: int = Field(default=300)
+    TRANSCRIPT_INDEX_CACHE_SIZE: int = Field(default=256)
+    RAG_TOP_K: int = Field(default=4)
 
     DEFAULT_LLM_MODEL: str = Field(default="gpt-4.1")
+    OPENAI_MODEL: str = Field(default="gpt-4o-mini")
+    ANTHROPIC_MODEL: str = Field(default="claude-3-5-sonnet-20241022")
     LLM_TEMPERATURE: float = Field(default=0.7)
     LLM_MAX_TOKENS: int = Field(default=2000)
 
+    # Prompt token budgets; the system prompt and transcript context always fit,
+    # older chat turns are dropped first
+    OPENAI_CONTEXT_TOKEN_BUDGET: int = Field(default=16000)
+    ANTHROPIC_CONTEXT_TOKEN_BUDGET: int = Field(default=16000)
+    TOKENIZER_ENCODING: str = Field(default="o200k_base")
+    # The encoding is loaded at startup from TIKTOKEN_CACHE_DIR (downloaded
+    # into it when missing). If it cannot be loaded within the timeout,
+    # token counts are estimated from text length, or startup fails when
+    # TOKENIZER_REQUIRED is set
+    TIKTOKEN_CACHE_DIR: Optional[str] = Field(default=None)
+    TOKENIZER_LOAD_TIMEOUT_SECONDS: float = Field(default=30.0)
+    TOKENIZER_REQUIRED: bool = Field(default=False)
+    TOKEN_COUNT_CACHE_SIZE: int = Field(default=50000)
+
+    # Older turns are folded into a per-chat summary once this many
+    # unsummarized messages accumulate; the newest KEEP_RECENT stay verbatim.
+    # A longer backlog is folded in passes of at most this many messages
+    CHAT_SUMMARY_TRIGGER_MESSAGES: int = Field(default=20)
+    CHAT_SUMMARY_KEEP_RECENT: int = Field(default=8)
+    CHAT_SUMMARY_MAX_TOKENS: int = Field(default=500)
+    # Messages returned with a chat, and the most history a prompt is built from
+    CHAT_RECENT_MESSAGES: int = Field(default=50)
+    CHAT_CONTEXT_MAX_MESSAGES: int = Field(default=200)
+    # Write-behind mode: messages are acknowledged once queued and inserted
+    # in batches of up to BATCH_SIZE, at most FLUSH_SECONDS after queueing.
+    # created_at comes from the database clock when the batch is written, as
+    # on the direct path; the one in the response is provisional. The queue
+    # lives in one process: only that process reads its own queued writes,
+    # other workers see them once the batch commits. It is drained on
+    # shutdown; a crash loses what it still holds
+    CHAT_WRITE_BEHIND_ENABLED: bool = Field(default=False)
+    CHAT_WRITE_BEHIND_MAX_QUEUE: int = Field(default=10000)
+    CHAT_WRITE_BEHIND_BATCH_SIZE: int = Field(default=500)
+    CHAT_WRITE_BEHIND_FLUSH_SECONDS: float = Field(default=0.05)
+
+    LLM_CACHE_ENABLED: bool = Field(default=True)
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=1000)
+    LLM_CACHE_TTL_SECONDS: int = Field(default=3600)
+    # Anthropic cache_control breakpoints on the stable prompt prefix
+    LLM_PROMPT_CACHING: bool = Field(default=True)
+
+    # Reuse answers to near-identical opening questions about the same transcript
+    SEMANTIC_CACHE_ENABLED: bool = Field(default=True)
+    SEMANTIC_CACHE_THRESHOLD: float = Field(default=0.95)
+    SEMANTIC_CACHE_FEATURES: int = Field(default=4096)
+    SEMANTIC_CACHE_MAX_PER_TRANSCRIPT: int = Field(default=200)
+    SEMANTIC_CACHE_MAX_TRANSCRIPTS: int = Field(default=1000)
+
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -1,15 +1,63 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import os
 
+from app.core.config import settings
+
 load_dotenv()
 
 DATABASE_URL = f"postgresql://{os.getenv('user')}:{os.getenv('password')}@{os.getenv('host')}:{os.getenv('port')}/{os.getenv('dbname')}"
 
+# asyncpg driver; prepared_statement_cache_size keeps compiled statements per connection
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{os.getenv('user')}:{os.getenv('password')}@{os.getenv('host')}:{os.getenv('port')}/{os.getenv('dbname')}"
+    f"?prepared_statement_cache_size={settings.DB_PREPARED_STATEMENT_CACHE_SIZE}"
+)
+
+# Synchronous engine is kept for scripts such as init_db
 engine = create_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
+
+
+def in_transaction(db: AsyncSession) -> bool:
+    return db.info.get("transaction_depth", 0) > 0
+
+
+@asynccontextmanager
+async def transaction(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    # Unit of work: repositories only flush, and the outermost scope on a
+    # session commits once (or rolls back) for everything nested inside it
+    depth = db.info.get("transaction_depth", 0)
+    db.info["transaction_depth"] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            await db.commit()
+    except BaseException:
+        if depth == 0:
+            await db.rollback()
+        raise
+    finally:
+        db.info["transaction_depth"] = depth
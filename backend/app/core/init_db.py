@@ -1,23 +1,37 @@
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
-from app.core.database import engine, Base, SessionLocal
-from app.core.security import hash_password
-from app.models import User, Chat, Message, Transcript, GenderEnum
+from app.core.database import engine, SessionLocal
+from app.core.password import hash_password_sync
+from app.models import User
 import logging
+import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+
 
 def init_db() -> None:
     try:
-        from app.models import User, Chat, Message, Transcript
+        logger.info("Applying database migrations...")
+        config = Config(ALEMBIC_INI)
+        config.attributes["configure_logger"] = False
+
+        tables = set(inspect(engine).get_table_names())
+        if "users" in tables and "alembic_version" not in tables:
+            # Created by create_all before migrations existed; revision 0002
+            # picks up whatever the old backfills had not done yet
+            logger.info("Unversioned database found, stamping it at the initial schema")
+            command.stamp(config, "0001")
 
-        logger.info("Creating database tables...")
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully!")
+        command.upgrade(config, "head")
+        logger.info("Database schema is up to date!")
 
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error(f"Error migrating database: {e}")
         raise
 
 
@@ -28,7 +42,7 @@ def create_admin_user(db: Session, email: str, password: str, name: str = "Admin
             logger.info(f"Admin user with email {email} already exists")
             return existing_user
 
-        hashed_password = hash_password(password)
+        hashed_password = hash_password_sync(password)
         admin_user = User(
             name=name,
             email=email,
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Any, Generic, List, Optional, TypeVar
+from uuid import UUID
+import base64
+import binascii
+import json
+
+T = TypeVar('T')
+
+
+class Cursor:
+    def __init__(self, created_at: datetime, id: UUID, backwards: bool = False):
+        self.created_at = created_at
+        self.id = id
+        self.backwards = backwards
+
+
+class PageResult(Generic[T]):
+    def __init__(self, items: List[T], next_cursor: Optional[str] = None, prev_cursor: Optional[str] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def encode_cursor(created_at: datetime, id: Any, backwards: bool = False) -> str:
+    payload = json.dumps([created_at.isoformat(), str(id), int(backwards)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id, backwards = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return Cursor(datetime.fromisoformat(created_at), UUID(id), bool(backwards))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
@@ -1,13 +1,36 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from app.core import password
 from app.core.config import settings
-from app.api.routes import user, chat, transcription
+from app.api.routes import user, chat, transcription, admin
+from app.services.auth_cache import auth_cache
+from app.services.llm import llm_service
+from app.services.message_writer import message_writer
+from app.services.transcript_jobs import transcript_job_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await llm_service.load_tokenizer()
+    auth_cache.start()
+    transcript_job_service.start()
+    message_writer.start()
+    yield
+    # Drained while the database is still reachable
+    await message_writer.stop()
+    await transcript_job_service.stop()
+    await auth_cache.stop()
+    password.shutdown()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="YouTube LLM Agent API for transcribing videos and chatting with AI about them"
+    description="YouTube LLM Agent API for transcribing videos and chatting with AI about them",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -18,9 +41,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Full transcripts compress well; small responses are left as they are
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 app.include_router(user.router)
 app.include_router(chat.router)
 app.include_router(transcription.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
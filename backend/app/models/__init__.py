@@ -1,11 +1,15 @@
 from app.models.chat import Chat, Message
-from app.models.transcript import Transcript
+from app.models.transcript import Transcript, TranscriptChunk, TranscriptSegment
+from app.models.transcript_job import TranscriptJob
 from app.models.user import User, GenderEnum
 
 __all__ = [
     "Chat",
     "Message",
     "Transcript",
+    "TranscriptChunk",
+    "TranscriptSegment",
+    "TranscriptJob",
     "User",
     "GenderEnum",
 ]
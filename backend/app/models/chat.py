@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, func, String, Text, Float, Integer, CheckConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, func, String, Text, Float, Integer, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -13,10 +13,25 @@ class Chat(Base):
     transcript_id = Column(UUID(as_uuid=True), ForeignKey("transcripts.transcript_id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="SET NULL"), nullable=True)
-
-    messages = relationship("Message", back_populates="chat", cascade="all, delete-orphan")
+    # Rolling summary of every message created at or before summarized_until
+    summary = Column(Text, nullable=True)
+    summarized_until = Column(DateTime(timezone=True), nullable=True)
+    # Maintained by database triggers, never written by the application
+    message_count = Column(Integer, nullable=False, server_default="0")
+
+    messages = relationship(
+        "Message",
+        back_populates="chat",
+        cascade="all, delete-orphan",
+        order_by="(Message.created_at, Message.message_id)",
+    )
     transcript = relationship("Transcript", backref="chats")
 
+    __table_args__ = (
+        Index("ix_chats_user_id_created_at", "user_id", "created_at", "chat_id"),
+        Index("ix_chats_transcript_id_user_id", "transcript_id", "user_id", "created_at", "chat_id"),
+    )
+
     def __repr__(self):
         return f"<Chat(chat_id={self.chat_id}, transcript_id={self.transcript_id})>"
 
@@ -29,12 +44,15 @@ class Message(Base):
     chat_id = Column(UUID(as_uuid=True), ForeignKey("chats.chat_id", ondelete="CASCADE"), nullable=False)
     sender = Column(String(50), nullable=False)
     message_text = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Advances within a transaction, so messages written together keep their order
+    created_at = Column(DateTime(timezone=True), server_default=func.clock_timestamp())
 
     chat = relationship("Chat", back_populates="messages")
 
     __table_args__ = (
         CheckConstraint("sender IN ('user', 'system', 'llm')", name="check_sender_valid"),
+        # Serves every history read: windows, pages and "since" syncs
+        Index("ix_messages_chat_id_created_at", "chat_id", "created_at", "message_id"),
     )
 
     def __repr__(self):
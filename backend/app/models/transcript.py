@@ -1,23 +1,92 @@
-from sqlalchemy import Column, String, Text, DateTime, Float, JSON, func
+from sqlalchemy import Column, String, Text, DateTime, Float, Integer, JSON, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 import uuid
 
 from app.core.database import Base
 
 
+def _text_length(context):
+    text = context.get_current_parameters().get("transcript_text")
+    return len(text) if text is not None else None
+
+
 class Transcript(Base):
     __tablename__ = "transcripts"
 
     transcript_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    video_url = Column(Text, nullable=False, unique=True, index=True)
+    video_id = Column(String(16), nullable=True)
+    video_url = Column(Text, nullable=False, index=True)
     transcript_text = Column(Text, nullable=True)
+    # Kept alongside the text so listings never have to read it
+    text_length = Column(Integer, nullable=True, default=_text_length)
     language = Column(String(50), nullable=True)
     duration = Column(Float, nullable=True)
     # metadata = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Maintained by database triggers, never written by the application
+    chat_count = Column(Integer, nullable=False, server_default="0")
+
+    chunks = relationship(
+        "TranscriptChunk",
+        back_populates="transcript",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="TranscriptChunk.chunk_index",
+    )
+
+    __table_args__ = (
+        Index("ix_transcripts_video_id_language", "video_id", "language", unique=True),
+        Index("ix_transcripts_created_at", "created_at", "transcript_id"),
+    )
 
     def __repr__(self):
         return (
             f"<Transcript(transcript_id={self.transcript_id}, "
-            f"video_url='{self.video_url}', language='{self.language}')>"
+            f"video_id='{self.video_id}', language='{self.language}')>"
+        )
+
+
+class TranscriptChunk(Base):
+    __tablename__ = "transcript_chunks"
+
+    chunk_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    transcript_id = Column(UUID(as_uuid=True), ForeignKey("transcripts.transcript_id", ondelete="CASCADE"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    start_time = Column(Float, nullable=True)
+    end_time = Column(Float, nullable=True)
+    chunk_text = Column(Text, nullable=False)
+
+    transcript = relationship("Transcript", back_populates="chunks")
+
+    __table_args__ = (
+        Index("ix_transcript_chunks_transcript_id_chunk_index", "transcript_id", "chunk_index", unique=True),
+    )
+
+    def __repr__(self):
+        return (
+            f"<TranscriptChunk(transcript_id={self.transcript_id}, "
+            f"chunk_index={self.chunk_index}, start_time={self.start_time})>"
+        )
+
+
+class TranscriptSegment(Base):
+    __tablename__ = "transcript_segments"
+
+    # One row per caption line as returned by YouTube, keyed without a
+    # surrogate id to keep the table small
+    transcript_id = Column(UUID(as_uuid=True), ForeignKey("transcripts.transcript_id", ondelete="CASCADE"), primary_key=True)
+    segment_index = Column(Integer, primary_key=True)
+    start_time = Column(Float, nullable=False)
+    duration = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+
+    __table_args__ = (
+        Index("ix_transcript_segments_transcript_id_start_time", "transcript_id", "start_time"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<TranscriptSegment(transcript_id={self.transcript_id}, "
+            f"segment_index={self.segment_index}, start_time={self.start_time})>"
         )
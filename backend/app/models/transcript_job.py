@@ -0,0 +1,46 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Index, CheckConstraint, func, text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+class TranscriptJob(Base):
+    __tablename__ = "transcript_jobs"
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    video_id = Column(String(16), nullable=False)
+    language = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, server_default="queued")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    max_attempts = Column(Integer, nullable=False)
+    last_error = Column(Text, nullable=True)
+    transcript_id = Column(UUID(as_uuid=True), ForeignKey("transcripts.transcript_id", ondelete="SET NULL"), nullable=True)
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="SET NULL"), nullable=True)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued', 'running', 'succeeded', 'failed')", name="check_job_status_valid"),
+        # At most one queued or running job per video, so repeated submissions share it
+        Index(
+            "ix_transcript_jobs_active_video",
+            "video_id",
+            "language",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+        Index("ix_transcript_jobs_status_run_after", "status", "run_after"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<TranscriptJob(job_id={self.job_id}, video_id='{self.video_id}', "
+            f"status='{self.status}', attempts={self.attempts})>"
+        )
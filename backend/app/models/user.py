@@ -28,6 +28,10 @@ class User(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Maintained by database triggers, never written by the application
+    chat_count = Column(Integer, nullable=False, server_default="0")
+    message_count = Column(Integer, nullable=False, server_default="0")
+
     def __repr__(self):
         return (
             f"<User(user_id={self.user_id}, name='{self.name}', email='{self.email}', "
@@ -2,10 +2,12 @@ from app.repositories.base import BaseRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.chat_repository import ChatRepository
 from app.repositories.transcript_repository import TranscriptRepository
+from app.repositories.transcript_job_repository import TranscriptJobRepository
 
 __all__ = [
     "BaseRepository",
     "UserRepository",
     "ChatRepository",
     "TranscriptRepository",
+    "TranscriptJobRepository",
 ]
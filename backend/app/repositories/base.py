@@ -1,35 +1,98 @@
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import func, inspect, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import Cursor, PageResult, decode_cursor, encode_cursor
 
 T = TypeVar('T')
 
 
 class BaseRepository(ABC, Generic[T]):
-    def __init__(self, model: type[T], db: Session):
+    def __init__(self, model: type[T], db: AsyncSession):
         self.model = model
         self.db = db
 
-    def create(self, obj: T) -> T:
+    async def create(self, obj: T) -> T:
+        # Server defaults come back through INSERT ... RETURNING; committing
+        # is left to the caller's unit of work
         self.db.add(obj)
-        self.db.commit()
-        self.db.refresh(obj)
+        await self.db.flush()
         return obj
 
-    def get(self, id) -> Optional[T]:
-        return self.db.query(self.model).get(id)
+    async def get(self, id) -> Optional[T]:
+        return await self.db.get(self.model, id)
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
+        result = await self.db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def count(self) -> int:
+        result = await self.db.execute(select(func.count()).select_from(self.model))
+        return result.scalar_one()
+
+    async def paginate(
+        self,
+        stmt=None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        descending: bool = True,
+        model=None,
+        position: Optional[Cursor] = None,
+        from_end: bool = False,
+        rows: bool = False
+    ) -> PageResult:
+        # Keyset pagination on (created_at, primary key): every page is an
+        # index range scan from the cursor, however deep it is. `position`
+        # is an already decoded cursor; `from_end` starts at the last page.
+        # With `rows` the statement selects plain columns, which must include
+        # created_at and the primary key under their own names
+        model = model or self.model
+        created_at = model.created_at
+        id_column = inspect(model).primary_key[0]
+        stmt = stmt if stmt is not None else select(model)
+
+        if cursor:
+            position = decode_cursor(cursor)
+        backwards = position.backwards if position else from_end
+        # Walking back reads the opposite direction and flips the page after
+        scan_descending = descending != backwards
+
+        if position:
+            key = tuple_(created_at, id_column)
+            bound = (position.created_at, position.id)
+            stmt = stmt.where(key < bound if scan_descending else key > bound)
+
+        if scan_descending:
+            stmt = stmt.order_by(created_at.desc(), id_column.desc())
+        else:
+            stmt = stmt.order_by(created_at.asc(), id_column.asc())
+
+        result = await self.db.execute(stmt.limit(limit + 1))
+        items = list(result.all() if rows else result.scalars().all())
+        has_more = len(items) > limit
+        items = items[:limit]
+        if backwards:
+            items.reverse()
+
+        next_cursor = prev_cursor = None
+        if items:
+            first, last = items[0], items[-1]
+            # Coming back from a later page there is always a next one
+            if (has_more and not backwards) or (backwards and position is not None):
+                next_cursor = encode_cursor(last.created_at, getattr(last, id_column.key))
+            if (has_more and backwards) or (position is not None and not backwards):
+                prev_cursor = encode_cursor(first.created_at, getattr(first, id_column.key), backwards=True)
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+        return PageResult(items, next_cursor, prev_cursor)
 
-    def update(self, obj: T, **kwargs) -> T:
+    async def update(self, obj: T, **kwargs) -> T:
         for key, value in kwargs.items():
             if hasattr(obj, key):
                 setattr(obj, key, value)
-        self.db.commit()
-        self.db.refresh(obj)
+        await self.db.flush()
         return obj
 
-    def delete(self, obj: T) -> None:
-        self.db.delete(obj)
-        self.db.commit()
+    async def delete(self, obj: T) -> None:
+        await self.db.delete(obj)
+        await self.db.flush()
@@ -1,9 +1,209 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+import uuid
+from sqlalchemy import Integer, column, delete, exists, func, insert, literal, literal_column, select, true, values
+from sqlalchemy.orm import selectinload
 
-from app.models.chat import Chat
+from app.core.pagination import Cursor, PageResult
+from app.models.chat import Chat, Message
 from app.repositories.base import BaseRepository
 
+MESSAGE_PREVIEW_CHARS = 200
+# Rows per INSERT, to stay under the driver's bind parameter limit
+INSERT_BATCH_SIZE = 1000
+
 
 class ChatRepository(BaseRepository):
-    def get_by_user_id(self, user_id: str) -> List[Chat]:
-        return self.db.query(self.model).filter(self.model.user_id == user_id).all()
+    def _summary_statement(self):
+        # One round trip for a whole page: the newest message comes from a
+        # (chat_id, created_at) index scan per chat, the count from the chat row
+        last_message = (
+            select(
+                func.left(Message.message_text, MESSAGE_PREVIEW_CHARS).label("last_message_preview"),
+                Message.created_at.label("last_message_at"),
+                Message.sender.label("last_message_sender")
+            )
+            .where(Message.chat_id == self.model.chat_id)
+            .order_by(Message.created_at.desc(), Message.message_id.desc())
+            .limit(1)
+            .lateral()
+        )
+        return (
+            select(
+                self.model.chat_id,
+                self.model.transcript_id,
+                self.model.created_at,
+                self.model.message_count,
+                last_message.c.last_message_preview,
+                last_message.c.last_message_at,
+                last_message.c.last_message_sender
+            )
+            .outerjoin(last_message, true())
+        )
+
+    async def get_summaries_by_user_id(self, user_id, cursor: Optional[str] = None, limit: int = 50) -> PageResult:
+        return await self.paginate(
+            self._summary_statement().where(self.model.user_id == user_id),
+            cursor=cursor,
+            limit=limit,
+            rows=True
+        )
+
+    async def get_summaries_by_transcript_id(
+        self,
+        transcript_id,
+        user_id=None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> PageResult:
+        stmt = self._summary_statement().where(self.model.transcript_id == transcript_id)
+        if user_id is not None:
+            stmt = stmt.where(self.model.user_id == user_id)
+        return await self.paginate(stmt, cursor=cursor, limit=limit, rows=True)
+
+    async def get_by_user_id(
+        self,
+        user_id,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        load_messages: bool = False
+    ) -> PageResult:
+        stmt = select(self.model).where(self.model.user_id == user_id)
+        if load_messages:
+            stmt = stmt.options(selectinload(self.model.messages))
+        return await self.paginate(stmt, cursor=cursor, limit=limit)
+
+    async def get_by_transcript_id(
+        self,
+        transcript_id,
+        user_id=None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        load_messages: bool = False
+    ) -> PageResult:
+        stmt = select(self.model).where(self.model.transcript_id == transcript_id)
+        if user_id is not None:
+            stmt = stmt.where(self.model.user_id == user_id)
+        if load_messages:
+            stmt = stmt.options(selectinload(self.model.messages))
+        return await self.paginate(stmt, cursor=cursor, limit=limit)
+
+    async def _message_position(self, chat_id, message_id, backwards: bool) -> Cursor:
+        message = await self.db.get(Message, message_id)
+        if not message or message.chat_id != chat_id:
+            raise ValueError(f"Message with ID {message_id} not found in this chat")
+        return Cursor(message.created_at, message.message_id, backwards)
+
+    async def get_messages(
+        self,
+        chat_id,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        before=None,
+        after=None,
+        latest: bool = False,
+        created_after: Optional[datetime] = None
+    ) -> PageResult:
+        # Always oldest first within a page, the order a conversation is
+        # read in; before/after anchor the window on a message id
+        position = None
+        if before is not None:
+            position = await self._message_position(chat_id, before, backwards=True)
+        elif after is not None:
+            position = await self._message_position(chat_id, after, backwards=False)
+
+        stmt = select(Message).where(Message.chat_id == chat_id)
+        if created_after is not None:
+            stmt = stmt.where(Message.created_at > created_after)
+
+        return await self.paginate(
+            stmt,
+            cursor=cursor,
+            limit=limit,
+            descending=False,
+            model=Message,
+            position=position,
+            from_end=latest
+        )
+
+    # Ownership is part of the WHERE clause, so a chat another user owns
+    # looks exactly like one that does not exist
+    async def get_for_user(self, chat_id, user_id) -> Optional[Chat]:
+        result = await self.db.execute(
+            select(self.model).where(self.model.chat_id == chat_id, self.model.user_id == user_id))
+        return result.scalars().first()
+
+    async def is_owned_by(self, chat_id, user_id) -> bool:
+        result = await self.db.execute(
+            select(exists().where(self.model.chat_id == chat_id, self.model.user_id == user_id)))
+        return result.scalar_one()
+
+    async def add_message_for_user(self, chat_id, user_id, sender: str, message_text: str) -> Optional[Message]:
+        # INSERT ... SELECT from the owned chat: authorizes and writes in one statement
+        owned_chat = select(
+            literal(uuid.uuid4(), Message.message_id.type),
+            self.model.chat_id,
+            literal(sender, Message.sender.type),
+            literal(message_text, Message.message_text.type)
+        ).where(self.model.chat_id == chat_id, self.model.user_id == user_id)
+        result = await self.db.scalars(
+            insert(Message)
+            .from_select(["message_id", "chat_id", "sender", "message_text"], owned_chat)
+            .returning(Message)
+        )
+        return result.first()
+
+    async def insert_messages(self, rows: List[Message]) -> List[Message]:
+        # Every write path stamps created_at from the database clock.
+        # clock_timestamp() is read again for each row, but consecutive rows
+        # can still get the same or nearly the same value, so each row is
+        # also offset by its rank within its chat to keep that chat's rows in
+        # order. now() would give every row the same value
+        messages = {}
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            new_messages = values(
+                column("message_id", Message.message_id.type),
+                column("chat_id", Message.chat_id.type),
+                column("sender", Message.sender.type),
+                column("message_text", Message.message_text.type),
+                column("position", Integer()),
+                name="new_messages"
+            ).data([
+                (row.message_id, row.chat_id, row.sender, row.message_text, position)
+                for position, row in enumerate(rows[start:start + INSERT_BATCH_SIZE])
+            ])
+            rank = func.row_number().over(
+                partition_by=new_messages.c.chat_id, order_by=new_messages.c.position) - 1
+            result = await self.db.scalars(
+                insert(Message)
+                .from_select(
+                    ["message_id", "chat_id", "sender", "message_text", "created_at"],
+                    select(
+                        new_messages.c.message_id,
+                        new_messages.c.chat_id,
+                        new_messages.c.sender,
+                        new_messages.c.message_text,
+                        func.clock_timestamp() + rank * literal_column("interval '1 microsecond'")
+                    )
+                )
+                .returning(Message)
+            )
+            messages.update({message.message_id: message for message in result.all()})
+        return [messages[row.message_id] for row in rows]
+
+    async def delete_for_user(self, chat_id, user_id) -> bool:
+        # Messages go with the chat through ON DELETE CASCADE
+        result = await self.db.execute(
+            delete(self.model)
+            .where(self.model.chat_id == chat_id, self.model.user_id == user_id)
+            .returning(self.model.chat_id)
+        )
+        return result.first() is not None
+
+    async def get_with_messages(self, chat_id) -> Optional[Chat]:
+        result = await self.db.execute(
+            select(self.model)
+            .where(self.model.chat_id == chat_id)
+            .options(selectinload(self.model.messages))
+        )
+        return result.scalars().first()
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.transcript_job import ACTIVE_JOB_STATUSES
+from app.repositories.base import BaseRepository
+
+
+class TranscriptJobRepository(BaseRepository):
+    async def get_active(self, video_id: str, language: str):
+        result = await self.db.execute(
+            select(self.model).where(
+                self.model.video_id == video_id,
+                self.model.language == language,
+                self.model.status.in_(ACTIVE_JOB_STATUSES)
+            ))
+        return result.scalars().first()
+
+    async def get_latest_succeeded(self, video_id: str, language: str, requested_by):
+        result = await self.db.execute(
+            select(self.model)
+            .where(
+                self.model.video_id == video_id,
+                self.model.language == language,
+                self.model.requested_by == requested_by,
+                self.model.status == "succeeded"
+            )
+            .order_by(self.model.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def insert_if_absent(self, **values):
+        # Returns None when the video already has a queued or running job
+        result = await self.db.execute(
+            insert(self.model)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=[self.model.video_id, self.model.language],
+                index_where=self.model.status.in_(ACTIVE_JOB_STATUSES)
+            )
+            .returning(self.model)
+        )
+        return result.scalars().first()
+
+    async def fail_abandoned(self, lease_expired_before: datetime) -> int:
+        # A job whose lease keeps expiring never reaches the retry check in
+        # the worker, so it is failed here once its attempts are used up
+        result = await self.db.execute(
+            update(self.model)
+            .where(
+                self.model.status == "running",
+                self.model.started_at < lease_expired_before,
+                self.model.attempts >= self.model.max_attempts
+            )
+            .values(
+                status="failed",
+                last_error="Lease expired on the last attempt",
+                finished_at=text("now()"),
+                updated_at=text("now()")
+            )
+        )
+        return result.rowcount
+
+    async def claim_next(self, lease_expired_before: datetime):
+        # SKIP LOCKED lets any number of workers, in any process, poll the
+        # same table without handing one job to two of them
+        claimable = (
+            select(self.model.job_id)
+            .where(or_(
+                (self.model.status == "queued") & (self.model.run_after <= text("now()")),
+                (self.model.status == "running")
+                & (self.model.started_at < lease_expired_before)
+                & (self.model.attempts < self.model.max_attempts)
+            ))
+            .order_by(self.model.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(self.model)
+            .where(self.model.job_id == claimable)
+            .values(
+                status="running",
+                attempts=self.model.attempts + 1,
+                started_at=text("now()"),
+                updated_at=text("now()")
+            )
+            .returning(self.model)
+        )
+        return result.scalars().first()
+
+    async def finish(self, job, status: str, transcript_id=None, last_error: Optional[str] = None,
+                     run_after: Optional[datetime] = None):
+        values = {
+            "status": status,
+            "transcript_id": transcript_id,
+            "last_error": last_error,
+            "updated_at": text("now()"),
+        }
+        if status == "queued":
+            values["run_after"] = run_after
+        else:
+            values["finished_at"] = text("now()")
+
+        # Guarded on this claim, so a worker whose lease expired cannot
+        # overwrite the result of the worker that reclaimed the job, or of
+        # fail_abandoned
+        await self.db.execute(
+            update(self.model)
+            .where(
+                self.model.job_id == job.job_id,
+                self.model.status == "running",
+                self.model.attempts == job.attempts,
+                self.model.started_at == job.started_at
+            )
+            .values(**values)
+        )
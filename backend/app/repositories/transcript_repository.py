@@ -1,6 +1,157 @@
+from typing import List, Optional
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import load_only
+
+from app.core.pagination import PageResult
+from app.models.transcript import TranscriptChunk, TranscriptSegment
 from app.repositories.base import BaseRepository
 
+# Rows per INSERT, to stay under the driver's bind parameter limit
+INSERT_BATCH_SIZE = 1000
+
 
 class TranscriptRepository(BaseRepository):
-    def get_by_video_url(self, video_url: str):
-        return self.db.query(self.model).filter(self.model.video_url == video_url).first()
+    async def get_summaries(self, cursor: Optional[str] = None, limit: int = 50) -> PageResult:
+        # raiseload makes any accidental access to the text fail loudly
+        # instead of quietly issuing one query per row
+        return await self.paginate(
+            select(self.model)
+            .options(load_only(
+                self.model.transcript_id,
+                self.model.video_id,
+                self.model.video_url,
+                self.model.language,
+                self.model.duration,
+                self.model.text_length,
+                self.model.chat_count,
+                self.model.created_at,
+                raiseload=True
+            )),
+            cursor=cursor,
+            limit=limit
+        )
+
+    async def get_by_video_id(self, video_id: str, language: str):
+        result = await self.db.execute(
+            select(self.model).where(
+                self.model.video_id == video_id,
+                self.model.language == language
+            ))
+        return result.scalars().first()
+
+    async def get_by_video_ids(self, video_ids: List[str], language: str):
+        if not video_ids:
+            return []
+        result = await self.db.execute(
+            select(self.model).where(
+                self.model.video_id.in_(video_ids),
+                self.model.language == language
+            ))
+        return list(result.scalars().all())
+
+    async def insert_if_absent(self, **values):
+        # Returns None when another request already stored this video
+        result = await self.db.execute(
+            insert(self.model)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[self.model.video_id, self.model.language])
+            .returning(self.model)
+        )
+        return result.scalars().first()
+
+    async def bulk_insert_if_absent(self, rows: List[dict]):
+        # Only the rows that were actually inserted are returned
+        result = await self.db.execute(
+            insert(self.model)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[self.model.video_id, self.model.language])
+            .returning(self.model)
+        )
+        return list(result.scalars().all())
+
+    async def get_chunks(self, transcript_id) -> List[TranscriptChunk]:
+        result = await self.db.execute(
+            select(TranscriptChunk)
+            .where(TranscriptChunk.transcript_id == transcript_id)
+            .order_by(TranscriptChunk.chunk_index)
+        )
+        return list(result.scalars().all())
+
+    async def _insert_ignoring_conflicts(self, model, rows: List[dict], index_elements: list) -> None:
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            await self.db.execute(
+                insert(model)
+                .values(rows[start:start + INSERT_BATCH_SIZE])
+                .on_conflict_do_nothing(index_elements=index_elements)
+            )
+
+    async def add_chunks(self, chunks: List[TranscriptChunk]) -> None:
+        await self._insert_ignoring_conflicts(
+            TranscriptChunk,
+            [
+                {
+                    "transcript_id": chunk.transcript_id,
+                    "chunk_index": chunk.chunk_index,
+                    "start_time": chunk.start_time,
+                    "end_time": chunk.end_time,
+                    "chunk_text": chunk.chunk_text,
+                }
+                for chunk in chunks
+            ],
+            [TranscriptChunk.transcript_id, TranscriptChunk.chunk_index]
+        )
+
+    async def add_segments(self, transcript_id, snippets: List[dict]) -> None:
+        await self._insert_ignoring_conflicts(
+            TranscriptSegment,
+            [
+                {
+                    "transcript_id": transcript_id,
+                    "segment_index": idx,
+                    "start_time": snippet["start"],
+                    "duration": snippet["duration"],
+                    "text": snippet["text"],
+                }
+                for idx, snippet in enumerate(snippets)
+            ],
+            [TranscriptSegment.transcript_id, TranscriptSegment.segment_index]
+        )
+
+    async def get_segments(self, transcript_id, start: float, end: Optional[float], limit: int) -> List[TranscriptSegment]:
+        # Lower bound is the last segment starting at or before `start`, so a
+        # line that is still being spoken at `start` is included and the scan
+        # stays within the (transcript_id, start_time) index
+        first_start = (
+            select(func.max(TranscriptSegment.start_time))
+            .where(
+                TranscriptSegment.transcript_id == transcript_id,
+                TranscriptSegment.start_time <= start
+            )
+            .scalar_subquery()
+        )
+        stmt = (
+            select(TranscriptSegment)
+            .where(
+                TranscriptSegment.transcript_id == transcript_id,
+                TranscriptSegment.start_time >= func.coalesce(first_start, start),
+                # Filtered here rather than after the LIMIT, so a page is
+                # never short by the segment that ended before `start`
+                or_(
+                    TranscriptSegment.start_time + TranscriptSegment.duration > start,
+                    TranscriptSegment.start_time >= start
+                )
+            )
+            .order_by(TranscriptSegment.start_time, TranscriptSegment.segment_index)
+            .limit(limit)
+        )
+        if end is not None:
+            stmt = stmt.where(TranscriptSegment.start_time < end)
+
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def exists(self, id) -> bool:
+        result = await self.db.execute(
+            select(self.model.transcript_id).where(self.model.transcript_id == id))
+        return result.first() is not None
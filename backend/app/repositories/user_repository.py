@@ -1,6 +1,10 @@
+from sqlalchemy import select
+
 from app.repositories.base import BaseRepository
 
 
 class UserRepository(BaseRepository):
-    def get_by_email(self, email: str):
-        return self.db.query(self.model).filter(self.model.email == email).first()
+    async def get_by_email(self, email: str):
+        result = await self.db.execute(
+            select(self.model).where(self.model.email == email))
+        return result.scalars().first()
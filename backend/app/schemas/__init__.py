@@ -1,3 +1,11 @@
+from app.schemas.admin import (
+    CacheStatsResponse,
+    LLMUsageStatsResponse,
+    ProviderUsageStats,
+    SemanticCachePurgeResponse,
+    TranscriptChatCount,
+    UsageStatsResponse,
+)
 from app.schemas.chat import (
     MessageBase,
     MessageCreate,
@@ -5,33 +13,61 @@ from app.schemas.chat import (
     ChatBase,
     ChatCreate,
     ChatResponse,
+    ChatSummaryResponse,
     LLMRequestSchema,
     LLMResponseSchema,
+    TokenUsageSchema,
 )
+from app.schemas.pagination import Page
 from app.schemas.transcript import (
     TranscriptBase,
+    TranscriptBatchCreate,
+    TranscriptBatchItem,
+    TranscriptBatchResponse,
     TranscriptCreate,
+    TranscriptJobResponse,
     TranscriptResponse,
+    TranscriptSegmentResponse,
+    TranscriptSegmentsResponse,
+    TranscriptSummaryResponse,
 )
 from app.schemas.user import (
     UserBase,
     UserCreate,
     UserResponse,
+    UserStatsResponse,
 )
 
 __all__ = [
+    "CacheStatsResponse",
+    "LLMUsageStatsResponse",
+    "ProviderUsageStats",
+    "SemanticCachePurgeResponse",
+    "TranscriptChatCount",
+    "UsageStatsResponse",
     "MessageBase",
     "MessageCreate",
     "MessageResponse",
     "ChatBase",
     "ChatCreate",
     "ChatResponse",
+    "ChatSummaryResponse",
     "LLMRequestSchema",
     "LLMResponseSchema",
+    "TokenUsageSchema",
+    "Page",
     "TranscriptBase",
+    "TranscriptBatchCreate",
+    "TranscriptBatchItem",
+    "TranscriptBatchResponse",
     "TranscriptCreate",
+    "TranscriptJobResponse",
     "TranscriptResponse",
+    "TranscriptSegmentResponse",
+    "TranscriptSegmentsResponse",
+    "TranscriptSummaryResponse",
     "UserBase",
     "UserCreate",
     "UserResponse",
+    "UserStatsResponse",
 ]
@@ -0,0 +1,59 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from uuid import UUID
+
+
+class CacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: Optional[int] = None
+
+
+class MessageQueueStatsResponse(BaseModel):
+    enabled: bool
+    running: bool
+    depth: int
+    max_size: int
+    pending_messages: int
+    pending_chats: int
+    enqueued: int
+    written: int
+    dropped: int
+    batches: int
+    avg_batch_size: float
+    last_batch_size: int
+    last_flush_ms: float
+
+
+class SemanticCachePurgeResponse(BaseModel):
+    transcript_id: UUID
+    removed_entries: int
+
+
+class ProviderUsageStats(BaseModel):
+    calls: int
+    input_tokens: int
+    cached_input_tokens: int
+    uncached_input_tokens: int
+    cache_write_tokens: int
+    output_tokens: int
+    cached_input_ratio: float
+
+
+class LLMUsageStatsResponse(BaseModel):
+    providers: Dict[str, ProviderUsageStats]
+
+
+class TranscriptChatCount(BaseModel):
+    transcript_id: UUID
+    video_id: Optional[str] = None
+    chat_count: int
+
+
+class UsageStatsResponse(BaseModel):
+    users: int
+    transcripts: int
+    chats: int
+    messages: int
+    top_transcripts: List[TranscriptChatCount]
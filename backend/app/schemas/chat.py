@@ -37,11 +37,39 @@ class ChatResponse(ChatBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ChatSummaryResponse(ChatBase):
+    chat_id: UUID
+    created_at: datetime
+    message_count: int
+    last_message_preview: Optional[str] = None
+    last_message_at: Optional[datetime] = None
+    last_message_sender: Optional[str] = None
+    # Only filled in when the listing is asked to include messages
+    messages: Optional[list[MessageResponse]] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class LLMRequestSchema(BaseModel):
     chat_id: UUID
     user_message: str
+    provider: str = "openai"
+    # Set to false to always get a fresh completion from the provider
+    use_cache: bool = True
+
+
+class TokenUsageSchema(BaseModel):
+    input_tokens: int
+    cached_input_tokens: int
+    uncached_input_tokens: int
+    cache_write_tokens: int
+    output_tokens: int
 
 
 class LLMResponseSchema(BaseModel):
     chat_id: UUID
     llm_message: str
+    prompt_tokens: Optional[int] = None
+    dropped_tokens: int = 0
+    # Reported by the provider; absent when the answer came from a cache
+    usage: Optional[TokenUsageSchema] = None
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Opaque; pass back as ?cursor= to fetch the neighbouring page
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -20,6 +20,77 @@ class TranscriptCreate(TranscriptBase):
 
 class TranscriptResponse(TranscriptBase):
     transcript_id: UUID
+    video_id: Optional[str] = None
+    text_length: Optional[int] = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+
+class TranscriptSummaryResponse(BaseModel):
+    transcript_id: UUID
+    video_id: Optional[str] = None
+    video_url: str
+    language: Optional[str] = None
+    duration: Optional[float] = None
+    text_length: Optional[int] = None
+    chat_count: int = 0
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TranscriptBatchCreate(BaseModel):
+    video_urls: List[str] = []
+    playlist_url: Optional[HttpUrl] = None
+    language: Optional[str] = None
+
+
+class TranscriptBatchItem(BaseModel):
+    video_url: str
+    video_id: Optional[str] = None
+    # created, existing, duplicate, invalid or failed
+    status: str
+    transcript_id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+
+class TranscriptBatchResponse(BaseModel):
+    items: List[TranscriptBatchItem]
+    created: int
+    existing: int
+    failed: int
+
+
+class TranscriptJobResponse(BaseModel):
+    job_id: UUID
+    video_id: str
+    language: str
+    # queued, running, succeeded or failed
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    transcript_id: Optional[UUID] = None
+    run_after: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TranscriptSegmentResponse(BaseModel):
+    start_time: float
+    duration: float
+    text: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TranscriptSegmentsResponse(BaseModel):
+    transcript_id: UUID
+    start: float
+    end: Optional[float] = None
+    segments: List[TranscriptSegmentResponse]
@@ -18,6 +18,11 @@ class UserCreate(UserBase):
 
 
 
+class UserStatsResponse(BaseModel):
+    chat_count: int
+    message_count: int
+
+
 class UserResponse(UserBase):
     user_id: UUID
     is_admin: bool
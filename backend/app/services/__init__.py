@@ -2,7 +2,11 @@ from app.services.base import BaseService
 from app.services.chat import ChatService, chat_service
 from app.services.user import UserService, user_service
 from app.services.youtube import TranscriptService, transcript_service
-from app.services.llm_service import llm_service
+from app.services.llm import llm_service
+from app.services.summary import ChatSummaryService, chat_summary_service
+from app.services.transcript_jobs import TranscriptJobService, transcript_job_service
+from app.services.stats import UsageStatsService, usage_stats_service
+from app.services.auth_cache import AuthCache, auth_cache
 
 __all__ = [
     "BaseService",
@@ -13,4 +17,12 @@ __all__ = [
     "TranscriptService",
     "transcript_service",
     "llm_service",
+    "ChatSummaryService",
+    "chat_summary_service",
+    "TranscriptJobService",
+    "transcript_job_service",
+    "UsageStatsService",
+    "usage_stats_service",
+    "AuthCache",
+    "auth_cache",
 ]
@@ -0,0 +1,131 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+import asyncio
+import hashlib
+import logging
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.user import UserResponse
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user_invalidated"
+
+
+class AuthCache:
+    def __init__(self, max_entries: int, ttl: float, enabled: bool = True):
+        self.ttl = ttl
+        self.enabled = enabled
+        # sha256(token) -> user id, so raw bearer tokens are never kept around
+        self._tokens = TTLCache(max_entries, ttl)
+        self._users = TTLCache(max_entries, ttl)
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _token_key(self, token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get_token_subject(self, token: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self._tokens.get(self._token_key(token))
+
+    def set_token_subject(self, token: str, subject: str, expires_at: Optional[float]) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl
+        if expires_at is not None:
+            # Never outlive the token itself
+            ttl = min(ttl, expires_at - time.time())
+            if ttl <= 0:
+                return
+        self._tokens.set(self._token_key(token), subject, ttl)
+
+    def get_user(self, user_id: UUID) -> Optional[UserResponse]:
+        if not self.enabled:
+            return None
+        user = self._users.get(user_id)
+        if user is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return user
+
+    def set_user(self, user: UserResponse) -> None:
+        if self.enabled:
+            self._users.set(user.user_id, user)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        self._users.delete(user_id)
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._users.clear()
+
+    async def publish_invalidation(self, db: AsyncSession, user_id: UUID) -> None:
+        # NOTIFY is transactional: the other workers hear about it only
+        # once the caller's change commits, and never if it rolls back
+        await db.execute(select(func.pg_notify(INVALIDATION_CHANNEL, str(user_id))))
+
+    def _on_notification(self, connection, pid, channel: str, payload: str) -> None:
+        try:
+            self.invalidate_user(UUID(payload))
+        except ValueError:
+            logger.warning(f"Ignoring malformed {channel} notification: {payload}")
+
+    def start(self) -> None:
+        if self.enabled and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        from app.core.database import DATABASE_URL
+
+        while True:
+            connection = None
+            closed = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(DATABASE_URL)
+                connection.add_termination_listener(lambda conn: closed.set())
+                await connection.add_listener(INVALIDATION_CHANNEL, self._on_notification)
+                await closed.wait()
+                logger.warning("Auth cache invalidation listener disconnected, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Auth cache invalidation listener failed: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+                # Notifications may have been missed while disconnected
+                self.clear()
+            await asyncio.sleep(settings.AUTH_CACHE_RECONNECT_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._users),
+        }
+
+
+auth_cache = AuthCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    enabled=settings.AUTH_CACHE_ENABLED
+)
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import TypeVar, Generic, List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import transaction
 from app.repositories.base import BaseRepository
 
 ModelType = TypeVar("ModelType")
@@ -12,45 +13,48 @@ class BaseService(ABC, Generic[ModelType, RepositoryType]):
         self.repository_class = repository_class
         self.model = model
 
-    def _get_repository(self, db: Session) -> RepositoryType:
+    def _get_repository(self, db: AsyncSession) -> RepositoryType:
         return self.repository_class(self.model, db)
 
-    def get_by_id(self, db: Session, id: int) -> Optional[ModelType]:
+    async def get_by_id(self, db: AsyncSession, id: int) -> Optional[ModelType]:
         repo = self._get_repository(db)
-        return repo.get(id)
+        return await repo.get(id)
 
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[ModelType]:
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ModelType]:
         repo = self._get_repository(db)
-        return repo.get_all(skip, limit)
+        return await repo.get_all(skip, limit)
 
-    def create(self, db: Session, obj: ModelType) -> ModelType:
+    async def create(self, db: AsyncSession, obj: ModelType) -> ModelType:
         self._validate_create(obj)
         repo = self._get_repository(db)
-        return repo.create(obj)
+        async with transaction(db):
+            return await repo.create(obj)
 
-    def update(self, db: Session, id: int, **kwargs) -> Optional[ModelType]:
+    async def update(self, db: AsyncSession, id: int, **kwargs) -> Optional[ModelType]:
         repo = self._get_repository(db)
-        obj = repo.get(id)
-        if not obj:
-            return None
-        self._validate_update(obj, kwargs)
-        return repo.update(obj, **kwargs)
+        async with transaction(db):
+            obj = await repo.get(id)
+            if not obj:
+                return None
+            self._validate_update(obj, kwargs)
+            return await repo.update(obj, **kwargs)
 
-    def delete(self, db: Session, id: int) -> bool:
+    async def delete(self, db: AsyncSession, id: int) -> bool:
         repo = self._get_repository(db)
-        obj = repo.get(id)
-        if not obj:
-            return False
-        self._validate_delete(obj)
-        repo.delete(obj)
+        async with transaction(db):
+            obj = await repo.get(id)
+            if not obj:
+                return False
+            self._validate_delete(obj)
+            await repo.delete(obj)
         return True
 
-    def exists(self, db: Session, id: int) -> bool:
-        return self.get_by_id(db, id) is not None
+    async def exists(self, db: AsyncSession, id: int) -> bool:
+        return await self.get_by_id(db, id) is not None
 
-    def count(self, db: Session) -> int:
+    async def count(self, db: AsyncSession) -> int:
         repo = self._get_repository(db)
-        return len(repo.get_all())
+        return await repo.count()
 
     @abstractmethod
     def _validate_create(self, obj: ModelType) -> None:
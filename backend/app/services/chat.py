@@ -1,10 +1,18 @@
-from typing import Optional, Dict, Any, List
-from sqlalchemy.orm import Session
-from uuid import UUID
-
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+from app.core.database import in_transaction, transaction
+from app.core.pagination import PageResult
 from app.services.base import BaseService
-from app.repositories.chat_repository import ChatRepository
+from app.services.message_writer import message_writer
+from app.repositories.chat_repository import MESSAGE_PREVIEW_CHARS, ChatRepository
 from app.models.chat import Chat, Message
+from app.models.user import User
 from app.schemas.chat import ChatCreate, MessageCreate
 
 
@@ -23,36 +31,86 @@ class ChatService(BaseService[Chat, ChatRepository]):
     def _validate_delete(self, obj: Chat) -> None:
         pass
 
-    def get_by_user_id(self, db: Session, user_id: UUID) -> List[Chat]:
+    def _summarize_loaded(self, page: PageResult) -> PageResult:
+        # Same shape as the summary rows, derived from the loaded messages
+        items = []
+        for chat in page.items:
+            last = chat.messages[-1] if chat.messages else None
+            items.append({
+                "chat_id": chat.chat_id,
+                "transcript_id": chat.transcript_id,
+                "created_at": chat.created_at,
+                "message_count": chat.message_count,
+                "last_message_preview": last.message_text[:MESSAGE_PREVIEW_CHARS] if last else None,
+                "last_message_at": last.created_at if last else None,
+                "last_message_sender": last.sender if last else None,
+                "messages": chat.messages,
+            })
+        return PageResult(items, page.next_cursor, page.prev_cursor)
+
+    async def get_by_user_id(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        include_messages: bool = False
+    ) -> PageResult:
+        repo = self._get_repository(db)
+        if include_messages:
+            page = await repo.get_by_user_id(user_id, cursor=cursor, limit=limit, load_messages=True)
+            return self._summarize_loaded(page)
+        return await repo.get_summaries_by_user_id(user_id, cursor=cursor, limit=limit)
+
+    async def get_messages(
+        self,
+        db: AsyncSession,
+        chat_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[UUID] = None,
+        after: Optional[UUID] = None
+    ) -> PageResult:
+        await message_writer.wait_for(chat_id)
         repo = self._get_repository(db)
-        return repo.get_by_user_id(str(user_id))
+        return await repo.get_messages(chat_id, cursor=cursor, limit=limit, before=before, after=after)
 
-    def create_chat(self, db: Session, user_id: UUID, transcript_id: Optional[UUID] = None) -> Chat:
+    async def get_recent_messages(
+        self,
+        db: AsyncSession,
+        chat_id: UUID,
+        limit: int,
+        created_after: Optional[datetime] = None
+    ) -> List[Message]:
+        await message_writer.wait_for(chat_id)
+        repo = self._get_repository(db)
+        page = await repo.get_messages(chat_id, limit=limit, latest=True, created_after=created_after)
+        return page.items
+
+    async def get_chat_history(self, db: AsyncSession, chat: Chat) -> List[Message]:
+        # Only what the prompt can use: turns after the summary checkpoint,
+        # capped so a very long chat never loads in full
+        created_after = chat.summarized_until if chat.summary else None
+        return await self.get_recent_messages(
+            db, chat.chat_id, settings.CHAT_CONTEXT_MAX_MESSAGES, created_after=created_after)
+
+    async def create_chat(self, db: AsyncSession, user_id: UUID, transcript_id: Optional[UUID] = None) -> Chat:
+        # A new chat has no messages; setting the collection up front saves
+        # loading it back after the insert
         chat = Chat(
             user_id=user_id,
-            transcript_id=transcript_id
+            transcript_id=transcript_id,
+            messages=[]
         )
 
-        return self.create(db, chat)
+        return await self.create(db, chat)
 
-    def get_chat_with_messages(self, db: Session, chat_id: UUID) -> Optional[Chat]:
-        chat = self.get_by_id(db, chat_id)
-        if chat:
-            if chat.messages:
-                chat.messages.sort(key=lambda m: m.created_at)
-        return chat
-
-    def add_message(
-        self,
-        db: Session,
-        chat_id: UUID,
-        sender: str,
-        message_text: str
-    ) -> Message:
-        chat = self.get_by_id(db, chat_id)
-        if not chat:
-            raise ValueError(f"Chat with ID {chat_id} not found")
+    async def get_chat_with_messages(self, db: AsyncSession, chat_id: UUID) -> Optional[Chat]:
+        await message_writer.wait_for(chat_id)
+        repo = self._get_repository(db)
+        return await repo.get_with_messages(chat_id)
 
+    def validate_message(self, sender: str, message_text: str) -> None:
         valid_senders = ['user', 'system', 'llm']
         if sender not in valid_senders:
             raise ValueError(
@@ -61,48 +119,132 @@ class ChatService(BaseService[Chat, ChatRepository]):
         if not message_text or len(message_text.strip()) == 0:
             raise ValueError("Message text cannot be empty")
 
-        message = Message(
-            chat_id=chat_id,
-            sender=sender,
-            message_text=message_text
-        )
+    async def add_message(
+        self,
+        db: AsyncSession,
+        chat_id: UUID,
+        sender: str,
+        message_text: str
+    ) -> Message:
+        messages = await self.add_messages(db, chat_id, [(sender, message_text)])
+        return messages[0]
+
+    async def add_messages(
+        self,
+        db: AsyncSession,
+        chat_id: UUID,
+        messages: List[Tuple[str, str]]
+    ) -> List[Message]:
+        # (sender, message_text) pairs, written with one multi-row INSERT in
+        # the caller's unit of work
+        for sender, message_text in messages:
+            self.validate_message(sender, message_text)
+
+        rows = [
+            Message(message_id=uuid4(), chat_id=chat_id, sender=sender, message_text=message_text)
+            for sender, message_text in messages
+        ]
+
+        # In write-behind mode the rows are stored by the next batch; writes
+        # that are part of a caller's unit of work stay in it
+        if message_writer.running and not in_transaction(db):
+            await message_writer.put(rows)
+            return rows
 
-        db.add(message)
-        db.commit()
-        db.refresh(message)
+        repo = self._get_repository(db)
+        try:
+            async with transaction(db):
+                return await repo.insert_messages(rows)
+        except IntegrityError:
+            # The chat_id foreign key stands in for a separate existence check
+            raise ValueError(f"Chat with ID {chat_id} not found")
 
-        return message
+    async def add_exchange(
+        self,
+        db: AsyncSession,
+        chat_id: UUID,
+        user_message: str,
+        llm_message: str
+    ) -> Tuple[Message, Message]:
+        # A question and its answer are stored together, once the answer exists
+        user, llm = await self.add_messages(db, chat_id, [("user", user_message), ("llm", llm_message)])
+        return user, llm
+
+    async def add_message_for_user(
+        self,
+        db: AsyncSession,
+        chat_id: UUID,
+        user_id: UUID,
+        sender: str,
+        message_text: str
+    ) -> Optional[Message]:
+        # None when the chat does not exist or belongs to someone else
+        self.validate_message(sender, message_text)
+        if message_writer.running:
+            # The queued insert cannot authorize itself, so ownership is
+            # checked up front
+            if not await self.chat_belongs_to_user(db, chat_id, user_id):
+                return None
+            messages = await self.add_messages(db, chat_id, [(sender, message_text)])
+            return messages[0]
 
-    def get_last_message(self, db: Session, chat_id: UUID) -> Optional[Message]:
-        message = db.query(Message).filter(
-            Message.chat_id == chat_id
-        ).order_by(Message.created_at.desc()).first()
+        repo = self._get_repository(db)
+        async with transaction(db):
+            return await repo.add_message_for_user(chat_id, user_id, sender, message_text)
+
+    async def get_last_message(self, db: AsyncSession, chat_id: UUID) -> Optional[Message]:
+        await message_writer.wait_for(chat_id)
+        result = await db.execute(
+            select(Message)
+            .where(Message.chat_id == chat_id)
+            .order_by(Message.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
 
-        return message
+    async def delete_chat_with_messages(self, db: AsyncSession, chat_id: UUID) -> bool:
+        await message_writer.wait_for(chat_id)
+        return await self.delete(db, chat_id)
 
-    def delete_chat_with_messages(self, db: Session, chat_id: UUID) -> bool:
-        return self.delete(db, chat_id)
+    async def delete_user_chat(self, db: AsyncSession, chat_id: UUID, user_id: UUID) -> bool:
+        # Queued messages are stored first and go with the chat
+        await message_writer.wait_for(chat_id)
+        repo = self._get_repository(db)
+        async with transaction(db):
+            return await repo.delete_for_user(chat_id, user_id)
 
-    def count_messages(self, db: Session, chat_id: UUID) -> int:
-        count = db.query(Message).filter(Message.chat_id == chat_id).count()
-        return count
+    async def count_messages(self, db: AsyncSession, chat_id: UUID) -> int:
+        result = await db.execute(select(Chat.message_count).where(Chat.chat_id == chat_id))
+        return result.scalar() or 0
 
-    def get_user_chat_count(self, db: Session, user_id: UUID) -> int:
-        count = db.query(Chat).filter(Chat.user_id == user_id).count()
-        return count
+    async def get_user_chat_count(self, db: AsyncSession, user_id: UUID) -> int:
+        result = await db.execute(select(User.chat_count).where(User.user_id == user_id))
+        return result.scalar() or 0
 
-    def chat_belongs_to_user(self, db: Session, chat_id: UUID, user_id: UUID) -> bool:
-        chat = self.get_by_id(db, chat_id)
-        if not chat:
-            return False
-        return chat.user_id == user_id
+    async def chat_belongs_to_user(self, db: AsyncSession, chat_id: UUID, user_id: UUID) -> bool:
+        repo = self._get_repository(db)
+        return await repo.is_owned_by(chat_id, user_id)
 
-    def get_chats_by_transcript(self, db: Session, transcript_id: UUID) -> List[Chat]:
-        chats = db.query(Chat).filter(
-            Chat.transcript_id == transcript_id
-        ).order_by(Chat.created_at.desc()).all()
+    async def get_user_chat(self, db: AsyncSession, chat_id: UUID, user_id: UUID) -> Optional[Chat]:
+        repo = self._get_repository(db)
+        return await repo.get_for_user(chat_id, user_id)
 
-        return chats
+    async def get_chats_by_transcript(
+        self,
+        db: AsyncSession,
+        transcript_id: UUID,
+        user_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        include_messages: bool = False
+    ) -> PageResult:
+        repo = self._get_repository(db)
+        if include_messages:
+            page = await repo.get_by_transcript_id(
+                transcript_id, user_id=user_id, cursor=cursor, limit=limit, load_messages=True)
+            return self._summarize_loaded(page)
+        return await repo.get_summaries_by_transcript_id(
+            transcript_id, user_id=user_id, cursor=cursor, limit=limit)
 
 
 chat_service = ChatService()
@@ -1,29 +1,73 @@
-from typing import List
-from app.services.llm.base import BaseLLM, LLMMessage as Message
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.services.llm.base import BaseLLM, LLMProvider, LLMMessage as Message, LLMResponse
+from app.services.llm.usage import LLMUsage
+
+CACHE_CONTROL = {"type": "ephemeral"}
 
 
 class AnthropicLLM(BaseLLM):
+    provider = LLMProvider.ANTHROPIC
+
     def __init__(self, api_key: str, model: str = "claude-3-5-sonnet-20241022", **kwargs):
         super().__init__(api_key, model, **kwargs)
         from anthropic import AsyncAnthropic
         self.client = AsyncAnthropic(api_key=api_key)
 
-    async def generate(self, messages: List[Message], **kwargs) -> str:
-        system_message = None
+    def _build_request(self, messages: List[Message], **kwargs) -> Dict[str, Any]:
+        system_blocks = []
         formatted_messages = []
 
         for msg in messages:
             if msg.role == "system":
-                system_message = msg.content
+                system_blocks.append({"type": "text", "text": msg.content})
             else:
                 formatted_messages.append(
-                    {"role": msg.role, "content": msg.content})
+                    {"role": msg.role, "content": [{"type": "text", "text": msg.content}]})
 
-        response = await self.client.messages.create(
-            model=self.model,
-            system=system_message,
-            messages=formatted_messages,
-            temperature=kwargs.get("temperature", self.temperature),
-            max_tokens=kwargs.get("max_tokens", self.max_tokens)
+        if self.prompt_caching:
+            # Breakpoints after the system prompt and after the previous turn,
+            # so follow-up questions in a chat reuse everything but the new one
+            if system_blocks:
+                system_blocks[-1]["cache_control"] = CACHE_CONTROL
+            if len(formatted_messages) > 1:
+                formatted_messages[-2]["content"][-1]["cache_control"] = CACHE_CONTROL
+
+        request_params = {
+            "model": self.model,
+            "messages": formatted_messages,
+            "temperature": kwargs.get("temperature", self.temperature),
+            "max_tokens": kwargs.get("max_tokens", self.max_tokens)
+        }
+
+        if system_blocks:
+            request_params["system"] = system_blocks
+
+        return request_params
+
+    def _parse_usage(self, usage) -> LLMUsage:
+        if usage is None:
+            return LLMUsage()
+
+        # Anthropic reports cache reads and writes separately from input_tokens
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return LLMUsage(
+            input_tokens=(usage.input_tokens or 0) + cache_read + cache_write,
+            cached_input_tokens=cache_read,
+            cache_write_tokens=cache_write,
+            output_tokens=usage.output_tokens or 0
         )
-        return response.content[0].text
+
+    async def generate(self, messages: List[Message], **kwargs) -> LLMResponse:
+        response = await self.client.messages.create(
+            **self._build_request(messages, **kwargs))
+        return LLMResponse(response.content[0].text, self._parse_usage(response.usage))
+
+    async def stream(self, messages: List[Message], usage: Optional[LLMUsage] = None, **kwargs) -> AsyncIterator[str]:
+        async with self.client.messages.stream(**self._build_request(messages, **kwargs)) as response:
+            async for text in response.text_stream:
+                yield text
+
+            if usage is not None:
+                final_message = await response.get_final_message()
+                usage.update(self._parse_usage(final_message.usage))
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from enum import Enum
 
+from app.services.llm.usage import LLMUsage
+
 
 class LLMProvider(str, Enum):
     OPENAI = "openai"
@@ -14,13 +16,33 @@ class LLMMessage:
         self.content = content
 
 
+class LLMResponse:
+    def __init__(self, text: str, usage: Optional[LLMUsage] = None):
+        self.text = text
+        self.usage = usage or LLMUsage()
+
+
 class BaseLLM(ABC):
-    def __init__(self, api_key: str, model: str, temperature: float = 0.7, max_tokens: int = 1000):
+    provider: LLMProvider
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        prompt_caching: bool = True
+    ):
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.prompt_caching = prompt_caching
+
+    @abstractmethod
+    async def generate(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+        pass
 
     @abstractmethod
-    async def generate(self, messages: List[LLMMessage], **kwargs) -> str:
+    def stream(self, messages: List[LLMMessage], usage: Optional[LLMUsage] = None, **kwargs) -> AsyncIterator[str]:
         pass
@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional
+import hashlib
+import json
+import re
+
+from app.core.cache import CacheBackend
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class LLMResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: Optional[float] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        # e.g. a Redis-backed implementation shared by all workers
+        self.backend = backend
+
+    def make_key(
+        self,
+        provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        messages: List[Dict[str, str]]
+    ) -> str:
+        normalized = [
+            [msg["role"], WHITESPACE_PATTERN.sub(" ", msg["content"]).strip()]
+            for msg in messages
+        ]
+        payload = json.dumps(
+            [provider, model, temperature, max_tokens, normalized],
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+        return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        await self.backend.set(key, value, self.ttl)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def stats(self) -> Dict[str, Optional[float]]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": await self.backend.size(),
+        }
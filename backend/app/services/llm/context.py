@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import math
+
+# Role/formatting tokens the chat APIs add around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class TokenCounter:
+    def __init__(self, encoding_name: str, cache_size: int = 10000):
+        self.encoding_name = encoding_name
+        self.cache_size = cache_size
+        self._encoding = None
+        self._cache: "OrderedDict[Any, int]" = OrderedDict()
+
+    def load_encoding(self):
+        # Blocking: reads the BPE file from TIKTOKEN_CACHE_DIR, downloading
+        # it first when it is not cached there
+        import tiktoken
+        return tiktoken.get_encoding(self.encoding_name)
+
+    def use_encoding(self, encoding) -> None:
+        self._encoding = encoding
+        # Counts cached so far were estimates
+        self._cache.clear()
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / 4)
+
+    def count_message(self, message) -> int:
+        key = getattr(message, "message_id", None)
+        if key is None:
+            return self.count(message.message_text) + MESSAGE_OVERHEAD_TOKENS
+
+        tokens = self._cache.get(key)
+        if tokens is None:
+            tokens = self.count(message.message_text) + MESSAGE_OVERHEAD_TOKENS
+            self._cache[key] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return tokens
+
+
+class ContextWindow:
+    def __init__(
+        self,
+        messages: List[Dict[str, str]],
+        prompt_tokens: int,
+        dropped_tokens: int = 0,
+        dropped_messages: int = 0
+    ):
+        self.messages = messages
+        self.prompt_tokens = prompt_tokens
+        self.dropped_tokens = dropped_tokens
+        self.dropped_messages = dropped_messages
+
+
+class ContextWindowManager:
+    def __init__(self, token_counter: TokenCounter):
+        self.token_counter = token_counter
+
+    def select_history(
+        self,
+        chat_messages: List,
+        budget: int,
+        system_prompt: Optional[str] = None,
+        pinned: Optional[List[str]] = None,
+        new_user_message: Optional[str] = None
+    ):
+        # System prompt, pinned context and the new question are always sent;
+        # the remaining budget is filled with the newest turns first
+        reserved = 0
+        for text in [system_prompt, new_user_message, *(pinned or [])]:
+            if text:
+                reserved += self.token_counter.count(text) + MESSAGE_OVERHEAD_TOKENS
+
+        remaining = budget - reserved
+        kept = []
+        used = 0
+        cutoff = len(chat_messages)
+
+        for idx in range(len(chat_messages) - 1, -1, -1):
+            tokens = self.token_counter.count_message(chat_messages[idx])
+            if used + tokens > remaining:
+                break
+            kept.append(chat_messages[idx])
+            used += tokens
+            cutoff = idx
+
+        kept.reverse()
+        dropped = chat_messages[:cutoff]
+        dropped_tokens = sum(self.token_counter.count_message(msg) for msg in dropped)
+
+        return kept, reserved + used, dropped_tokens, len(dropped)
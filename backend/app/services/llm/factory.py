@@ -0,0 +1,17 @@
+from typing import Optional
+
+from app.core.config import settings
+from app.services.llm.base import BaseLLM, LLMProvider
+from app.services.llm.openai import OpenAILLM
+from app.services.llm.anthropic import AnthropicLLM
+
+
+class LLMFactory:
+    @staticmethod
+    def create_llm(provider: LLMProvider, api_key: str, model: Optional[str] = None, **kwargs) -> BaseLLM:
+        if provider == LLMProvider.OPENAI:
+            return OpenAILLM(api_key, model or settings.OPENAI_MODEL, **kwargs)
+        elif provider == LLMProvider.ANTHROPIC:
+            return AnthropicLLM(api_key, model or settings.ANTHROPIC_MODEL, **kwargs)
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
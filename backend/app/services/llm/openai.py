@@ -1,21 +1,54 @@
-from typing import List
-from app.services.llm.base import BaseLLM, LLMMessage as Message
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.services.llm.base import BaseLLM, LLMProvider, LLMMessage as Message, LLMResponse
+from app.services.llm.usage import LLMUsage
 
 
 class OpenAILLM(BaseLLM):
+    provider = LLMProvider.OPENAI
+
     def __init__(self, api_key: str, model: str = "gpt-4", **kwargs):
         super().__init__(api_key, model, **kwargs)
         from openai import AsyncOpenAI
         self.client = AsyncOpenAI(api_key=api_key)
 
-    async def generate(self, messages: List[Message], **kwargs) -> str:
+    def _build_request(self, messages: List[Message], **kwargs) -> Dict[str, Any]:
+        # OpenAI caches prompt prefixes automatically, so callers keep the
+        # stable messages first and anything request-specific last
         formatted_messages = [
             {"role": msg.role, "content": msg.content} for msg in messages]
 
+        return {
+            "model": self.model,
+            "messages": formatted_messages,
+            "temperature": kwargs.get("temperature", self.temperature),
+            "max_tokens": kwargs.get("max_tokens", self.max_tokens)
+        }
+
+    def _parse_usage(self, usage) -> LLMUsage:
+        if usage is None:
+            return LLMUsage()
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        return LLMUsage(
+            input_tokens=usage.prompt_tokens or 0,
+            cached_input_tokens=getattr(details, "cached_tokens", None) or 0,
+            output_tokens=usage.completion_tokens or 0
+        )
+
+    async def generate(self, messages: List[Message], **kwargs) -> LLMResponse:
+        response = await self.client.chat.completions.create(
+            **self._build_request(messages, **kwargs))
+        return LLMResponse(response.choices[0].message.content, self._parse_usage(response.usage))
+
+    async def stream(self, messages: List[Message], usage: Optional[LLMUsage] = None, **kwargs) -> AsyncIterator[str]:
         response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=formatted_messages,
-            temperature=kwargs.get("temperature", self.temperature),
-            max_tokens=kwargs.get("max_tokens", self.max_tokens)
+            **self._build_request(messages, **kwargs),
+            stream=True,
+            stream_options={"include_usage": True}
         )
-        return response.choices[0].message.content
+
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage is not None and usage is not None:
+                usage.update(self._parse_usage(chunk.usage))
@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, Optional, Tuple
+import re
+import zlib
+
+import numpy as np
+
+from app.core.cache import TTLCache
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+# Words that can change between two phrasings of the same question. Anything
+# else, including negations, ordinals and question words, must match exactly
+STOPWORDS = frozenset({
+    "a", "an", "the", "this", "that", "these", "those", "it", "its",
+    "is", "are", "was", "were", "be", "been", "do", "does", "did",
+    "of", "in", "on", "at", "to", "for", "from", "by", "with", "about",
+    "and", "or", "i", "me", "my", "you", "your", "we", "us",
+    "can", "could", "would", "please", "tell",
+})
+
+
+def content_terms(text: str) -> frozenset:
+    return frozenset(word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS)
+
+
+class HashingVectorizer:
+    def __init__(self, n_features: int = 4096):
+        self.n_features = n_features
+
+    def _features(self, text: str) -> List[str]:
+        words = WORD_PATTERN.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+        # Character trigrams make "summarize"/"summary" and typos land close together
+        for word in words:
+            padded = f"<{word}>"
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def transform(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        for feature in self._features(text):
+            # crc32 instead of hash() so vectors are identical across workers
+            h = zlib.crc32(feature.encode("utf-8"))
+            vector[h % self.n_features] += 1.0 if (h >> 31) & 1 else -1.0
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class TranscriptAnswerTable:
+    def __init__(self, n_features: int, max_entries: int):
+        self.max_entries = max_entries
+        self.vectors = np.zeros((0, n_features), dtype=np.float32)
+        self.terms: List[frozenset] = []
+        self.questions: List[str] = []
+        self.answers: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def nearest(self, vector: np.ndarray, terms: frozenset):
+        # Only questions with the same content terms are candidates: the
+        # hashed features score "first part" and "last part" as close
+        candidates = [i for i, entry_terms in enumerate(self.terms) if entry_terms == terms]
+        if not candidates:
+            return None, 0.0
+        similarities = self.vectors[candidates] @ vector
+        best = int(np.argmax(similarities))
+        return candidates[best], float(similarities[best])
+
+    def add(self, vector: np.ndarray, terms: frozenset, question: str, answer: str) -> None:
+        self.vectors = np.vstack([self.vectors, vector[np.newaxis, :]])
+        self.terms.append(terms)
+        self.questions.append(question)
+        self.answers.append(answer)
+
+        overflow = len(self.answers) - self.max_entries
+        if overflow > 0:
+            self.vectors = self.vectors[overflow:]
+            self.terms = self.terms[overflow:]
+            self.questions = self.questions[overflow:]
+            self.answers = self.answers[overflow:]
+
+
+# (transcript_id, provider, model): an answer is only reused for the
+# provider and model that produced it
+SemanticScope = Tuple[Any, str, str]
+
+
+class SemanticAnswerCache:
+    def __init__(
+        self,
+        threshold: float,
+        n_features: int = 4096,
+        max_entries_per_transcript: int = 200,
+        max_transcripts: int = 1000,
+        ttl: Optional[float] = None
+    ):
+        self.threshold = threshold
+        self.max_entries_per_transcript = max_entries_per_transcript
+        self.vectorizer = HashingVectorizer(n_features)
+        self._tables = TTLCache(max_transcripts, ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def _table(self, scope: SemanticScope, create: bool = False) -> Optional[TranscriptAnswerTable]:
+        transcript_id, provider, model = scope
+        # Grouped per transcript so purge() drops every model's answers at once
+        tables = self._tables.get(transcript_id)
+        if tables is None:
+            if not create:
+                return None
+            tables = {}
+            self._tables.set(transcript_id, tables)
+
+        table = tables.get((provider, model))
+        if table is None and create:
+            table = TranscriptAnswerTable(
+                self.vectorizer.n_features, self.max_entries_per_transcript)
+            tables[(provider, model)] = table
+        return table
+
+    def lookup(self, scope: SemanticScope, question: str) -> Optional[str]:
+        table = self._table(scope)
+        if table is not None:
+            idx, similarity = table.nearest(self.vectorizer.transform(question), content_terms(question))
+            if idx is not None and similarity >= self.threshold:
+                self.hits += 1
+                return table.answers[idx]
+
+        self.misses += 1
+        return None
+
+    def add(self, scope: SemanticScope, question: str, answer: str) -> None:
+        table = self._table(scope, create=True)
+        vector = self.vectorizer.transform(question)
+        terms = content_terms(question)
+        idx, similarity = table.nearest(vector, terms)
+        if idx is not None and similarity >= self.threshold:
+            return
+        table.add(vector, terms, question, answer)
+
+    def purge(self, transcript_id) -> int:
+        tables = self._tables.get(transcript_id)
+        self._tables.delete(transcript_id)
+        return sum(len(table) for table in tables.values()) if tables is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": sum(
+                len(table) for tables in self._tables.values() for table in tables.values()),
+        }
@@ -0,0 +1,278 @@
+from typing import AsyncIterator, Dict, List, Optional
+import logging
+import os
+
+import anyio
+
+from app.core.cache import InMemoryCacheBackend
+from app.core.config import settings
+from app.services.llm.base import BaseLLM, LLMMessage, LLMProvider
+from app.services.llm.cache import LLMResponseCache
+from app.services.llm.context import ContextWindow, ContextWindowManager, TokenCounter
+from app.services.llm.factory import LLMFactory
+from app.services.llm.semantic_cache import SemanticAnswerCache
+from app.services.llm.usage import LLMUsage, LLMUsageStats
+
+logger = logging.getLogger(__name__)
+
+
+PROVIDER_ALIASES = {
+    "claude": LLMProvider.ANTHROPIC,
+}
+
+
+class LLMService:
+    def __init__(self):
+        self._llms: Dict[LLMProvider, BaseLLM] = {}
+        self.context_manager = ContextWindowManager(
+            TokenCounter(settings.TOKENIZER_ENCODING, settings.TOKEN_COUNT_CACHE_SIZE))
+        self.response_cache = LLMResponseCache(
+            InMemoryCacheBackend(settings.LLM_CACHE_MAX_ENTRIES),
+            ttl=settings.LLM_CACHE_TTL_SECONDS
+        )
+        self.semantic_cache = SemanticAnswerCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            n_features=settings.SEMANTIC_CACHE_FEATURES,
+            max_entries_per_transcript=settings.SEMANTIC_CACHE_MAX_PER_TRANSCRIPT,
+            max_transcripts=settings.SEMANTIC_CACHE_MAX_TRANSCRIPTS,
+            ttl=settings.LLM_CACHE_TTL_SECONDS
+        )
+        self.usage_stats = LLMUsageStats()
+
+    async def load_tokenizer(self) -> None:
+        # Called once at startup, so no request blocks the event loop on
+        # reading or downloading the encoding file
+        counter = self.context_manager.token_counter
+        if settings.TIKTOKEN_CACHE_DIR:
+            os.environ["TIKTOKEN_CACHE_DIR"] = settings.TIKTOKEN_CACHE_DIR
+        try:
+            with anyio.fail_after(settings.TOKENIZER_LOAD_TIMEOUT_SECONDS):
+                encoding = await anyio.to_thread.run_sync(counter.load_encoding, abandon_on_cancel=True)
+        except Exception as e:
+            if settings.TOKENIZER_REQUIRED:
+                raise RuntimeError(f"Tokenizer '{counter.encoding_name}' could not be loaded: {e}") from e
+            logger.warning(f"Tokenizer '{counter.encoding_name}' unavailable, estimating token counts: {e}")
+            return
+        counter.use_encoding(encoding)
+
+    def _resolve_provider(self, provider: str) -> LLMProvider:
+        if provider in PROVIDER_ALIASES:
+            return PROVIDER_ALIASES[provider]
+        try:
+            return LLMProvider(provider)
+        except ValueError:
+            raise ValueError(f"Invalid provider: {provider}")
+
+    def _get_api_key(self, provider: LLMProvider) -> Optional[str]:
+        if provider == LLMProvider.OPENAI:
+            return settings.OPENAI_API_KEY
+        if provider == LLMProvider.ANTHROPIC:
+            return settings.ANTHROPIC_API_KEY
+        return None
+
+    def _get_model(self, provider: LLMProvider) -> str:
+        if provider == LLMProvider.OPENAI:
+            return settings.OPENAI_MODEL
+        return settings.ANTHROPIC_MODEL
+
+    def _get_context_budget(self, provider: LLMProvider) -> int:
+        if provider == LLMProvider.OPENAI:
+            return settings.OPENAI_CONTEXT_TOKEN_BUDGET
+        return settings.ANTHROPIC_CONTEXT_TOKEN_BUDGET
+
+    def get_llm(self, provider: str) -> BaseLLM:
+        provider = self._resolve_provider(provider)
+
+        llm = self._llms.get(provider)
+        if llm is None:
+            api_key = self._get_api_key(provider)
+            if not api_key:
+                raise ValueError(f"{provider.value} API key not configured")
+
+            llm = LLMFactory.create_llm(
+                provider,
+                api_key,
+                self._get_model(provider),
+                temperature=settings.LLM_TEMPERATURE,
+                max_tokens=settings.LLM_MAX_TOKENS,
+                prompt_caching=settings.LLM_PROMPT_CACHING
+            )
+            self._llms[provider] = llm
+
+        return llm
+
+    def _build_kwargs(self, temperature: Optional[float], max_tokens: Optional[int]) -> Dict[str, float]:
+        kwargs = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        return kwargs
+
+    def _cache_key(
+        self,
+        llm: BaseLLM,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        return self.response_cache.make_key(
+            llm.provider.value,
+            llm.model,
+            temperature if temperature is not None else llm.temperature,
+            max_tokens if max_tokens is not None else llm.max_tokens,
+            messages
+        )
+
+    def _record_usage(self, llm: BaseLLM, usage: LLMUsage) -> None:
+        self.usage_stats.record(llm.provider.value, usage)
+        logger.info(
+            f"{llm.provider.value} call: {usage.input_tokens} input tokens "
+            f"({usage.cached_input_tokens} cached, {usage.uncached_input_tokens} uncached), "
+            f"{usage.output_tokens} output tokens")
+
+    async def generate_response(
+        self,
+        provider: str,
+        messages: List[Dict[str, str]],
+        temperature: float = None,
+        max_tokens: int = None,
+        use_cache: bool = True,
+        usage: Optional[LLMUsage] = None
+    ) -> str:
+        llm = self.get_llm(provider)
+
+        cache_key = None
+        if use_cache and settings.LLM_CACHE_ENABLED:
+            cache_key = self._cache_key(llm, messages, temperature, max_tokens)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        msg_objects = [LLMMessage(msg["role"], msg["content"])
+                       for msg in messages]
+
+        try:
+            response = await llm.generate(msg_objects, **self._build_kwargs(temperature, max_tokens))
+        except Exception as e:
+            raise ValueError(f"{llm.provider.value} API error: {str(e)}")
+
+        self._record_usage(llm, response.usage)
+        if usage is not None:
+            usage.update(response.usage)
+
+        response_text = response.text
+
+        if cache_key is not None and response_text:
+            await self.response_cache.set(cache_key, response_text)
+
+        return response_text
+
+    async def stream_response(
+        self,
+        provider: str,
+        messages: List[Dict[str, str]],
+        temperature: float = None,
+        max_tokens: int = None,
+        use_cache: bool = True,
+        usage: Optional[LLMUsage] = None
+    ) -> AsyncIterator[str]:
+        llm = self.get_llm(provider)
+
+        cache_key = None
+        if use_cache and settings.LLM_CACHE_ENABLED:
+            cache_key = self._cache_key(llm, messages, temperature, max_tokens)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        msg_objects = [LLMMessage(msg["role"], msg["content"])
+                       for msg in messages]
+
+        parts = []
+        stream_usage = LLMUsage()
+        try:
+            async for delta in llm.stream(msg_objects, usage=stream_usage, **self._build_kwargs(temperature, max_tokens)):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            raise ValueError(f"{llm.provider.value} API error: {str(e)}")
+
+        self._record_usage(llm, stream_usage)
+        if usage is not None:
+            usage.update(stream_usage)
+
+        # Only complete replies are cached, never ones cut short by a disconnect
+        if cache_key is not None and parts:
+            await self.response_cache.set(cache_key, "".join(parts))
+
+    def build_context_window(
+        self,
+        provider: str,
+        chat_messages: List,
+        new_user_message: str,
+        system_prompt: str = None,
+        context: str = None,
+        summary: str = None
+    ) -> ContextWindow:
+        budget = self._get_context_budget(self._resolve_provider(provider))
+
+        history, prompt_tokens, dropped_tokens, dropped_messages = self.context_manager.select_history(
+            chat_messages,
+            budget,
+            system_prompt=system_prompt,
+            pinned=[text for text in (summary, context) if text],
+            new_user_message=new_user_message
+        )
+
+        if dropped_messages:
+            logger.info(
+                f"Context budget {budget} exceeded, dropped {dropped_messages} messages ({dropped_tokens} tokens)")
+
+        messages = self.format_chat_history(
+            history, new_user_message, system_prompt=system_prompt, context=context, summary=summary)
+
+        return ContextWindow(messages, prompt_tokens, dropped_tokens, dropped_messages)
+
+    def format_chat_history(
+        self,
+        chat_messages: List,
+        new_user_message: str,
+        system_prompt: str = None,
+        context: str = None,
+        summary: str = None
+    ) -> List[Dict[str, str]]:
+        # Ordered from most to least stable so provider prompt caches can reuse
+        # the prefix: instructions, summary, earlier turns, then the new
+        # question together with the excerpts retrieved for it
+        messages = []
+
+        if system_prompt:
+            messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+
+        if summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{summary}"
+            })
+
+        for msg in chat_messages:
+            role = "assistant" if msg.sender == "llm" else "user"
+            messages.append({
+                "role": role,
+                "content": msg.message_text
+            })
+
+        messages.append({
+            "role": "user",
+            "content": f"{context}\n\nQuestion: {new_user_message}" if context else new_user_message
+        })
+
+        return messages
+
+
+llm_service = LLMService()
@@ -0,0 +1,74 @@
+from typing import Any, Dict, Optional
+import threading
+
+
+class LLMUsage:
+    def __init__(
+        self,
+        input_tokens: int = 0,
+        cached_input_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        output_tokens: int = 0
+    ):
+        # input_tokens is the whole prompt, cached or not
+        self.input_tokens = input_tokens
+        self.cached_input_tokens = cached_input_tokens
+        self.cache_write_tokens = cache_write_tokens
+        self.output_tokens = output_tokens
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        return self.input_tokens - self.cached_input_tokens
+
+    def update(self, other: "LLMUsage") -> None:
+        self.input_tokens = other.input_tokens
+        self.cached_input_tokens = other.cached_input_tokens
+        self.cache_write_tokens = other.cache_write_tokens
+        self.output_tokens = other.output_tokens
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "uncached_input_tokens": self.uncached_input_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+class LLMUsageStats:
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, usage: Optional[LLMUsage]) -> None:
+        if usage is None:
+            return
+
+        with self._lock:
+            totals = self._totals.setdefault(provider, {
+                "calls": 0,
+                "input_tokens": 0,
+                "cached_input_tokens": 0,
+                "uncached_input_tokens": 0,
+                "cache_write_tokens": 0,
+                "output_tokens": 0,
+            })
+            totals["calls"] += 1
+            for name, value in usage.to_dict().items():
+                totals[name] += value
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for provider, totals in self._totals.items():
+                input_tokens = totals["input_tokens"]
+                result[provider] = {
+                    **totals,
+                    "cached_input_ratio": totals["cached_input_tokens"] / input_tokens if input_tokens else 0.0,
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
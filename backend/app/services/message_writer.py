@@ -0,0 +1,225 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+import asyncio
+import logging
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, transaction
+from app.models.chat import Chat, Message
+from app.repositories.chat_repository import ChatRepository
+
+logger = logging.getLogger(__name__)
+
+# Queue markers: cut the current batch short, and stop once drained
+_FLUSH = object()
+_STOP = object()
+
+WRITE_ATTEMPTS = 3
+WRITE_RETRY_SECONDS = 0.5
+
+
+class MessageWriteBehind:
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, enabled: bool = False):
+        self.max_size = max_size
+        self.batch_size = min(batch_size, max_size)
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._accepting = False
+        self._flush_requested = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Queued but not yet stored, per chat; counted before the put so a
+        # producer waiting on a full queue is already accounted for
+        self._pending: Dict[UUID, int] = {}
+        self._waiters: Dict[UUID, List[asyncio.Future]] = {}
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._accepting and self._flusher is not None and not self._flusher.done()
+
+    def start(self) -> None:
+        if self.enabled and self._flusher is None:
+            self._queue = asyncio.Queue(self.max_size)
+            self._accepting = True
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Everything accepted before this call is stored before it returns
+        if self._flusher is None:
+            return
+        self._accepting = False
+        await self._queue.put(_STOP)
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        self._flusher = None
+        if self._pending:
+            logger.error(f"Message writer stopped with {sum(self._pending.values())} messages unwritten")
+            self._settle_all()
+
+    async def put(self, messages: List[Message]) -> None:
+        # Ids are assigned here so callers can return the messages right
+        # away. created_at is provisional: the database stamps the stored
+        # row when its batch is written, like on every other write path.
+        # The queue being full holds the caller back
+        queued_at = datetime.now(timezone.utc)
+        for message in messages:
+            if message.message_id is None:
+                message.message_id = uuid4()
+            message.created_at = queued_at
+            self._pending[message.chat_id] = self._pending.get(message.chat_id, 0) + 1
+
+        for queued, message in enumerate(messages):
+            try:
+                await self._queue.put(message)
+            except asyncio.CancelledError:
+                # The rest never reached the queue
+                self._settle(messages[queued:])
+                raise
+            self.enqueued += 1
+
+    async def wait_for(self, chat_id: UUID) -> None:
+        # Read-your-writes: returns once every message queued for the chat
+        # by this process is stored
+        if chat_id not in self._pending:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(chat_id, []).append(waiter)
+        self._request_flush()
+        await waiter
+
+    def _request_flush(self) -> None:
+        if self._flush_requested or self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(_FLUSH)
+            self._flush_requested = True
+        except asyncio.QueueFull:
+            # A full queue is already being flushed by batch size
+            pass
+
+    async def _run(self) -> None:
+        stopping = False
+        # Puts still waiting on a full queue when stop() was called are
+        # counted in _pending, so they are written as well
+        while not (stopping and not self._pending):
+            batch, stop = await self._next_batch()
+            stopping = stopping or stop
+            if batch:
+                await self._write(batch)
+
+    async def _next_batch(self) -> Tuple[List[Message], bool]:
+        batch = []
+        try:
+            while len(batch) < self.batch_size:
+                item = await self._queue.get()
+                if item is _STOP:
+                    return batch, True
+                if item is _FLUSH:
+                    self._flush_requested = False
+                    if batch:
+                        break
+                    continue
+                batch.append(item)
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(
+                        self.flush_interval, self._request_flush)
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return batch, False
+
+    async def _insert(self, batch: List[Message]) -> None:
+        # One multi-row INSERT and one commit for the whole batch
+        async with AsyncSessionLocal() as db, transaction(db):
+            stored = await ChatRepository(Chat, db).insert_messages(batch)
+        for message, row in zip(batch, stored):
+            message.created_at = row.created_at
+
+    async def _write(self, batch: List[Message]) -> None:
+        started = time.perf_counter()
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                await self._insert(batch)
+                self.written += len(batch)
+                break
+            except IntegrityError:
+                # Usually a chat deleted while its messages were queued; only
+                # the offending rows are dropped
+                await self._write_rows(batch)
+                break
+            except Exception as e:
+                if attempt == WRITE_ATTEMPTS:
+                    self.dropped += len(batch)
+                    logger.error(f"Dropping a batch of {len(batch)} messages after {attempt} attempts: {e}")
+                    break
+                logger.warning(f"Writing a batch of {len(batch)} messages failed, retrying: {e}")
+                await asyncio.sleep(WRITE_RETRY_SECONDS * attempt)
+
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self._settle(batch)
+
+    async def _write_rows(self, batch: List[Message]) -> None:
+        for message in batch:
+            try:
+                await self._insert([message])
+                self.written += 1
+            except Exception as e:
+                self.dropped += 1
+                logger.error(f"Dropping message {message.message_id} for chat {message.chat_id}: {e}")
+
+    def _settle(self, batch: List[Message]) -> None:
+        for message in batch:
+            remaining = self._pending.get(message.chat_id, 0) - 1
+            if remaining > 0:
+                self._pending[message.chat_id] = remaining
+                continue
+            self._pending.pop(message.chat_id, None)
+            self._wake(message.chat_id)
+
+    def _settle_all(self) -> None:
+        for chat_id in list(self._pending):
+            self._pending.pop(chat_id)
+            self._wake(chat_id)
+
+    def _wake(self, chat_id: UUID) -> None:
+        for waiter in self._waiters.pop(chat_id, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "pending_messages": sum(self._pending.values()),
+            "pending_chats": len(self._pending),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "avg_batch_size": (self.written + self.dropped) / self.batches if self.batches else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+message_writer = MessageWriteBehind(
+    max_size=settings.CHAT_WRITE_BEHIND_MAX_QUEUE,
+    batch_size=settings.CHAT_WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=settings.CHAT_WRITE_BEHIND_FLUSH_SECONDS,
+    enabled=settings.CHAT_WRITE_BEHIND_ENABLED
+)
@@ -0,0 +1,41 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.models.chat import Chat
+from app.models.transcript import Transcript
+from app.models.user import User
+
+
+class UsageStatsService:
+    # Reads the trigger-maintained counter columns; nothing here scans messages
+
+    async def get_user_stats(self, db: AsyncSession, user_id: UUID) -> Optional[Dict[str, int]]:
+        result = await db.execute(
+            select(User.chat_count, User.message_count).where(User.user_id == user_id))
+        row = result.first()
+        if row is None:
+            return None
+        return {"chat_count": row.chat_count, "message_count": row.message_count}
+
+    async def get_totals(self, db: AsyncSession) -> Dict[str, int]:
+        result = await db.execute(select(
+            select(func.count()).select_from(User).scalar_subquery().label("users"),
+            select(func.count()).select_from(Transcript).scalar_subquery().label("transcripts"),
+            select(func.count()).select_from(Chat).scalar_subquery().label("chats"),
+            select(func.coalesce(func.sum(Chat.message_count), 0)).scalar_subquery().label("messages"),
+        ))
+        return dict(result.one()._mapping)
+
+    async def get_top_transcripts(self, db: AsyncSession, limit: int = 10) -> List[Dict[str, Any]]:
+        result = await db.execute(
+            select(Transcript.transcript_id, Transcript.video_id, Transcript.chat_count)
+            .where(Transcript.chat_count > 0)
+            .order_by(Transcript.chat_count.desc(), Transcript.transcript_id)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in result]
+
+
+usage_stats_service = UsageStatsService()
@@ -0,0 +1,136 @@
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, transaction
+from app.models.chat import Chat, Message
+from app.services.llm import llm_service
+from app.services.message_writer import message_writer
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an AI assistant "
+    "about a YouTube video. Update the existing summary with the new messages. Keep facts, "
+    "questions the user asked and conclusions reached; drop small talk. Reply with the "
+    "updated summary only."
+)
+
+
+class ChatSummaryService:
+    def __init__(self):
+        self._in_progress: Set[UUID] = set()
+
+    def split_history(self, chat: Chat, chat_messages: List[Message]) -> Tuple[Optional[str], List[Message]]:
+        if not chat.summary or chat.summarized_until is None:
+            return None, list(chat_messages)
+
+        recent = [msg for msg in chat_messages if msg.created_at > chat.summarized_until]
+        return chat.summary, recent
+
+    def needs_update(self, unsummarized_count: int) -> bool:
+        return unsummarized_count >= settings.CHAT_SUMMARY_TRIGGER_MESSAGES
+
+    def _format_transcript(self, messages: List[Message]) -> str:
+        lines = []
+        for msg in messages:
+            speaker = "Assistant" if msg.sender == "llm" else "User"
+            lines.append(f"{speaker}: {msg.message_text}")
+        return "\n".join(lines)
+
+    async def _fold_next(
+        self,
+        db: AsyncSession,
+        chat_id: UUID,
+        summary: Optional[str],
+        checkpoint: Optional[datetime],
+        provider: str
+    ) -> Optional[Tuple[str, datetime]]:
+        # Folds the next slice after the checkpoint; returns the new summary
+        # and checkpoint, or None when there is not enough to fold
+        batch_size = settings.CHAT_SUMMARY_TRIGGER_MESSAGES
+        keep_recent = settings.CHAT_SUMMARY_KEEP_RECENT
+
+        stmt = select(Message).where(Message.chat_id == chat_id)
+        if checkpoint is not None:
+            stmt = stmt.where(Message.created_at > checkpoint)
+        result = await db.execute(
+            stmt.order_by(Message.created_at, Message.message_id).limit(batch_size + keep_recent))
+        pending = list(result.scalars().all())
+        # Ends the read transaction so no connection sits idle in it through
+        # the LLM call; the update below runs in a short transaction of its own
+        await db.commit()
+
+        if len(pending) < batch_size:
+            return None
+
+        # The newest turns stay verbatim in the prompt
+        to_fold = pending[:max(len(pending) - keep_recent, 0)][:batch_size]
+        if not to_fold:
+            return None
+
+        user_content = ""
+        if summary:
+            user_content += f"Existing summary:\n{summary}\n\n"
+        user_content += f"New messages:\n{self._format_transcript(to_fold)}"
+
+        new_summary = await llm_service.generate_response(
+            provider=provider,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": user_content}
+            ],
+            temperature=0.2,
+            max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS
+        )
+
+        # Conditional on the old checkpoint so a concurrent worker's
+        # summary is never overwritten with an older one
+        checkpoint_filter = (
+            Chat.summarized_until.is_(None)
+            if checkpoint is None
+            else Chat.summarized_until == checkpoint
+        )
+        new_checkpoint = to_fold[-1].created_at
+        async with transaction(db):
+            result = await db.execute(
+                update(Chat)
+                .where(Chat.chat_id == chat_id, checkpoint_filter)
+                .values(summary=new_summary, summarized_until=new_checkpoint)
+            )
+        if result.rowcount == 0:
+            return None
+        return new_summary, new_checkpoint
+
+    async def update_summary(self, chat_id: UUID, provider: str) -> None:
+        if chat_id in self._in_progress:
+            return
+        self._in_progress.add(chat_id)
+
+        try:
+            await message_writer.wait_for(chat_id)
+            async with AsyncSessionLocal() as db:
+                chat = await db.get(Chat, chat_id)
+                if not chat:
+                    return
+
+                # A long backlog (e.g. the first summary of an old chat) is
+                # folded in several passes of at most TRIGGER messages, so a
+                # single prompt never carries the whole history
+                summary, checkpoint = chat.summary, chat.summarized_until
+                while True:
+                    folded = await self._fold_next(db, chat_id, summary, checkpoint, provider)
+                    if folded is None:
+                        break
+                    summary, checkpoint = folded
+        except Exception as e:
+            logger.error(f"Failed to update summary for chat {chat_id}: {e}")
+        finally:
+            self._in_progress.discard(chat_id)
+
+
+chat_summary_service = ChatSummaryService()
@@ -0,0 +1,143 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+STOPWORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "be", "but", "by", "do", "does", "for",
+    "from", "how", "i", "in", "is", "it", "its", "of", "on", "or", "so", "that",
+    "the", "their", "there", "they", "this", "to", "was", "we", "what", "when",
+    "where", "which", "who", "why", "will", "with", "you", "your",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+def format_timestamp(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def parse_timestamp(value: str) -> float:
+    # Accepts seconds ("600", "600.5") or clock time ("10:00", "1:02:03")
+    value = value.strip()
+    try:
+        parts = [float(part) for part in value.split(":")]
+    except ValueError:
+        raise ValueError(f"Invalid timestamp: {value}")
+
+    # float() also takes "nan", "inf" and "1e309", none of which is a time
+    if len(parts) > 3 or any(not math.isfinite(part) or part < 0 for part in parts):
+        raise ValueError(f"Invalid timestamp: {value}")
+
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    if not math.isfinite(seconds):
+        raise ValueError(f"Invalid timestamp: {value}")
+    return seconds
+
+
+def chunk_snippets(snippets: List[Dict[str, Any]], max_chars: int) -> List[Dict[str, Any]]:
+    chunks = []
+    texts = []
+    size = 0
+    start = None
+    end = None
+
+    for snippet in snippets:
+        text = snippet["text"].strip()
+        if not text:
+            continue
+
+        if texts and size + len(text) > max_chars:
+            chunks.append({"text": " ".join(texts), "start": start, "end": end})
+            texts, size, start = [], 0, None
+
+        if start is None:
+            start = snippet["start"]
+        end = snippet["start"] + snippet["duration"]
+        texts.append(text)
+        size += len(text) + 1
+
+    if texts:
+        chunks.append({"text": " ".join(texts), "start": start, "end": end})
+
+    return chunks
+
+
+def chunk_text(text: str, max_chars: int) -> List[Dict[str, Any]]:
+    # Transcripts stored without timing information are split on sentences
+    pieces = SENTENCE_PATTERN.split(text) if text else []
+    snippets = []
+    for piece in pieces:
+        while len(piece) > max_chars:
+            snippets.append(piece[:max_chars])
+            piece = piece[max_chars:]
+        snippets.append(piece)
+
+    chunks = chunk_snippets(
+        [{"text": piece, "start": 0.0, "duration": 0.0} for piece in snippets],
+        max_chars
+    )
+    for chunk in chunks:
+        chunk["start"] = None
+        chunk["end"] = None
+    return chunks
+
+
+class BM25Index:
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(doc)) for doc in documents]
+        self.doc_lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_doc_length = (
+            sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+        )
+
+        doc_freqs = Counter()
+        for tf in self.term_freqs:
+            doc_freqs.update(tf.keys())
+
+        n_docs = len(documents)
+        self.idf = {
+            term: math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.term_freqs)
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        terms = [term for term in set(tokenize(query)) if term in self.idf]
+        if not terms or not self.avg_doc_length:
+            return []
+
+        scores = []
+        for idx, tf in enumerate(self.term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avg_doc_length)
+            score = 0.0
+            for term in terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            if score > 0:
+                scores.append((idx, score))
+
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:k]
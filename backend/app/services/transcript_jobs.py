@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, transaction
+from app.models.transcript_job import TranscriptJob
+from app.repositories.transcript_job_repository import TranscriptJobRepository
+from app.schemas.transcript import TranscriptCreate
+from app.services.base import BaseService
+from app.services.youtube import TranscriptUnavailableError, extract_video_id, transcript_service
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptJobService(BaseService[TranscriptJob, TranscriptJobRepository]):
+    def __init__(self):
+        super().__init__(TranscriptJobRepository, TranscriptJob)
+        self._workers: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def _validate_create(self, obj: TranscriptJob) -> None:
+        if not obj.video_id:
+            raise ValueError("Video ID is required")
+
+    def _validate_update(self, obj: TranscriptJob, update_data: Dict[str, Any]) -> None:
+        pass
+
+    def _validate_delete(self, obj: TranscriptJob) -> None:
+        pass
+
+    async def enqueue(self, db: AsyncSession, transcript_data: TranscriptCreate,
+                      user_id: Optional[UUID] = None) -> TranscriptJob:
+        video_id = extract_video_id(str(transcript_data.video_url))
+        language = transcript_data.language or settings.TRANSCRIPT_DEFAULT_LANGUAGE
+        repo = self._get_repository(db)
+
+        transcript = await transcript_service.get_by_video_id(db, video_id, language)
+        if transcript:
+            # Nothing to fetch, but clients still get a job to poll; the
+            # caller's earlier one is reused so resubmitting adds no rows
+            job = await repo.get_latest_succeeded(video_id, language, user_id) if user_id else None
+            if job is not None and job.transcript_id == transcript.transcript_id:
+                return job
+            return await self.create(db, TranscriptJob(
+                video_id=video_id,
+                language=language,
+                status="succeeded",
+                max_attempts=settings.TRANSCRIPT_JOB_MAX_ATTEMPTS,
+                transcript_id=transcript.transcript_id,
+                requested_by=user_id,
+                finished_at=datetime.now(timezone.utc)
+            ))
+
+        async with transaction(db):
+            job = await repo.insert_if_absent(
+                video_id=video_id,
+                language=language,
+                max_attempts=settings.TRANSCRIPT_JOB_MAX_ATTEMPTS,
+                requested_by=user_id
+            )
+        if job is None:
+            # Already queued or running: the caller shares that job
+            job = await repo.get_active(video_id, language)
+            if job is None:
+                # It finished in between
+                return await self.enqueue(db, transcript_data, user_id)
+            return job
+
+        self._wakeup.set()
+        return job
+
+    def start(self, concurrency: Optional[int] = None) -> None:
+        concurrency = settings.TRANSCRIPT_JOB_CONCURRENCY if concurrency is None else concurrency
+        for worker_id in range(concurrency):
+            self._workers.append(asyncio.create_task(self._worker_loop(worker_id)))
+        if concurrency:
+            logger.info(f"Started {concurrency} transcript job workers")
+
+    async def stop(self) -> None:
+        # Jobs interrupted here are picked up again once their lease expires
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    async def _worker_loop(self, worker_id: int) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await self._claim_next()
+            except Exception as e:
+                logger.error(f"Transcript job worker {worker_id} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.TRANSCRIPT_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(job)
+
+    async def _claim_next(self) -> Optional[TranscriptJob]:
+        lease_expired_before = datetime.now(timezone.utc) - timedelta(seconds=settings.TRANSCRIPT_JOB_LEASE_SECONDS)
+        async with AsyncSessionLocal() as db, transaction(db):
+            repo = self._get_repository(db)
+            abandoned = await repo.fail_abandoned(lease_expired_before)
+            if abandoned:
+                logger.warning(f"Failed {abandoned} transcript jobs whose lease expired on their last attempt")
+            return await repo.claim_next(lease_expired_before)
+
+    def _backoff(self, attempts: int) -> float:
+        return min(
+            settings.TRANSCRIPT_JOB_BACKOFF_SECONDS * 2 ** (attempts - 1),
+            settings.TRANSCRIPT_JOB_BACKOFF_MAX_SECONDS
+        )
+
+    async def _run(self, job: TranscriptJob) -> None:
+        status, transcript_id, error, run_after = "succeeded", None, None, None
+        try:
+            transcript_id = await transcript_service.ingest_video(job.video_id, job.language)
+        except TranscriptUnavailableError as e:
+            status, error = "failed", str(e)
+        except Exception as e:
+            error = str(e)
+            if job.attempts >= job.max_attempts:
+                status = "failed"
+            else:
+                delay = self._backoff(job.attempts)
+                status = "queued"
+                run_after = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                logger.info(
+                    f"Transcript job {job.job_id} attempt {job.attempts} failed, retrying in {delay:.0f}s: {e}")
+
+        try:
+            async with AsyncSessionLocal() as db, transaction(db):
+                await self._get_repository(db).finish(
+                    job, status, transcript_id=transcript_id, last_error=error, run_after=run_after)
+        except Exception as e:
+            logger.error(f"Failed to record result of transcript job {job.job_id}: {e}")
+
+
+transcript_job_service = TranscriptJobService()
@@ -1,16 +1,15 @@
 from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import transaction
+from app.core.password import hash_password, needs_rehash, verify_password
+from app.services.auth_cache import auth_cache
 from app.services.base import BaseService
 from app.repositories.user_repository import UserRepository
 from app.models.user import User
 from app.schemas.user import UserCreate
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 class UserService(BaseService[User, UserRepository]):
     def __init__(self):
         super().__init__(UserRepository, User)
@@ -38,17 +37,17 @@ class UserService(BaseService[User, UserRepository]):
     def _validate_delete(self, obj: User) -> None:
         pass
 
-    def get_by_email(self, db: Session, email: str) -> Optional[User]:
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         repo = self._get_repository(db)
-        return repo.get_by_email(email)
+        return await repo.get_by_email(email)
 
-    def create_user(self, db: Session, user_data: UserCreate) -> User:
-        existing_user = self.get_by_email(db, user_data.email)
+    async def create_user(self, db: AsyncSession, user_data: UserCreate) -> User:
+        existing_user = await self.get_by_email(db, user_data.email)
         if existing_user:
             raise ValueError(
                 f"User with email {user_data.email} already exists")
 
-        hashed_password = self._hash_password(user_data.password)
+        hashed_password = await hash_password(user_data.password)
 
         user = User(
             name=user_data.name,
@@ -59,32 +58,48 @@ class UserService(BaseService[User, UserRepository]):
             birth_date=user_data.birth_date,
         )
 
-        return self.create(db, user)
-
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return await self.create(db, user)
 
-    def _hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await verify_password(plain_password, hashed_password)
 
-    def authenticate_user(self, db: Session, email: str, password: str) -> Optional[User]:
-        user = self.get_by_email(db, email)
+    async def authenticate_user(self, db: AsyncSession, email: str, password: str) -> Optional[User]:
+        user = await self.get_by_email(db, email)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password(password, user.hashed_password):
             return None
 
+        # The plain password is only available here, so hashes made with an
+        # older work factor are upgraded on the next successful login
+        if needs_rehash(user.hashed_password):
+            hashed_password = await hash_password(password)
+            repo = self._get_repository(db)
+            async with transaction(db):
+                user = await repo.update(user, hashed_password=hashed_password)
+
         return user
 
-    def update_user_profile(self, db: Session, user_id: int, **kwargs) -> Optional[User]:
+    async def update_user_profile(self, db: AsyncSession, user_id: int, **kwargs) -> Optional[User]:
         if "password" in kwargs:
             plain_password = kwargs.pop("password")
-            kwargs["hashed_password"] = self._hash_password(plain_password)
+            kwargs["hashed_password"] = await hash_password(plain_password)
+
+        async with transaction(db):
+            await auth_cache.publish_invalidation(db, user_id)
+            user = await self.update(db, user_id, **kwargs)
+        auth_cache.invalidate_user(user_id)
+        return user
 
-        return self.update(db, user_id, **kwargs)
+    async def delete(self, db: AsyncSession, id) -> bool:
+        async with transaction(db):
+            await auth_cache.publish_invalidation(db, id)
+            deleted = await super().delete(db, id)
+        auth_cache.invalidate_user(id)
+        return deleted
 
-    def user_exists(self, db: Session, email: str) -> bool:
-        return self.get_by_email(db, email) is not None
+    async def user_exists(self, db: AsyncSession, email: str) -> bool:
+        return await self.get_by_email(db, email) is not None
 
 
 user_service = UserService()
@@ -1,19 +1,90 @@
 from typing import Optional, Dict, Any, List
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from urllib.parse import parse_qs, urlsplit
 from uuid import UUID
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+import asyncio
+import httpx
 import re
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, transaction
+from app.core.pagination import PageResult
+from app.core.singleflight import SingleFlight
 from app.services.base import BaseService
+from app.services.transcript_index import BM25Index, chunk_snippets, chunk_text
 from app.repositories.transcript_repository import TranscriptRepository
-from app.models.transcript import Transcript
-from app.schemas.transcript import TranscriptBase, TranscriptCreate, TranscriptResponse
+from app.models.transcript import Transcript, TranscriptChunk, TranscriptSegment
+from app.schemas.transcript import TranscriptBase, TranscriptBatchCreate, TranscriptCreate, TranscriptResponse
+
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+VIDEO_PATH_PATTERN = re.compile(r"^/(?:embed|v|e|shorts|live)/([^/?#&]+)")
+YOUTUBE_HOSTS = frozenset({"youtube.com", "youtube-nocookie.com"})
+HOST_PREFIXES = ("www.", "m.", "music.")
+PLAYLIST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{10,64}$")
+PLAYLIST_VIDEO_ID_PATTERN = re.compile(r'"playlistVideoRenderer":\s*\{\s*"videoId":\s*"([A-Za-z0-9_-]{11})"')
+PLAYLIST_CONTINUATION_PATTERN = re.compile(r'"continuationCommand":\s*\{\s*"token":\s*"([^"]+)"')
+INNERTUBE_KEY_PATTERN = re.compile(r'"INNERTUBE_API_KEY":"([^"]+)"')
+INNERTUBE_VERSION_PATTERN = re.compile(r'"INNERTUBE_CLIENT_VERSION":"([^"]+)"')
+
+
+class TranscriptUnavailableError(ValueError):
+    # The video has no transcript to fetch; retrying will not help
+    pass
+
+
+def extract_video_id(url: str) -> str:
+    url = url.strip()
+    if VIDEO_ID_PATTERN.match(url):
+        return url
+
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = (parts.hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    candidate = None
+    if host == "youtu.be":
+        candidate = parts.path.lstrip("/").split("/")[0]
+    elif host in YOUTUBE_HOSTS:
+        if parts.path in ("/watch", "/watch/"):
+            candidate = parse_qs(parts.query).get("v", [None])[0]
+        else:
+            match = VIDEO_PATH_PATTERN.match(parts.path)
+            if match:
+                candidate = match.group(1)
+
+    if candidate and VIDEO_ID_PATTERN.match(candidate):
+        return candidate
+
+    raise ValueError(f"Could not extract video ID from URL: {url}")
+
+
+def extract_playlist_id(url: str) -> str:
+    url = url.strip()
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    playlist_id = parse_qs(parts.query).get("list", [None])[0]
+
+    if playlist_id and PLAYLIST_ID_PATTERN.match(playlist_id):
+        return playlist_id
+
+    raise ValueError(f"Could not extract playlist ID from URL: {url}")
+
+
+def canonical_video_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
 
 
 class TranscriptService(BaseService[Transcript, TranscriptRepository]):
     def __init__(self):
         super().__init__(TranscriptRepository, Transcript)
+        self.index_cache = TTLCache(settings.TRANSCRIPT_INDEX_CACHE_SIZE)
+        self._ingestions = SingleFlight()
 
     def _validate_create(self, obj: Transcript) -> None:
         if not obj.video_url:
@@ -51,31 +122,36 @@ class TranscriptService(BaseService[Transcript, TranscriptRepository]):
     def _validate_delete(self, obj: Transcript) -> None:
         pass
 
-    def get_by_url(self, db: Session, url: str) -> Optional[Transcript]:
-        repo = self._get_repository(db)
-        return repo.get_by_video_url(video_url=url)
+    async def delete(self, db: AsyncSession, id: UUID) -> bool:
+        deleted = await super().delete(db, id)
+        if deleted:
+            self.index_cache.delete(id)
+        return deleted
 
-    def _extract_video_id(self, url: str) -> str:
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([^&\n?#]+)',
-            r'youtube\.com\/embed\/([^&\n?#]+)',
-            r'youtube\.com\/v\/([^&\n?#]+)'
-        ]
+    async def get_summaries(self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 50) -> PageResult:
+        repo = self._get_repository(db)
+        return await repo.get_summaries(cursor=cursor, limit=limit)
 
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
+    async def get_by_video_id(self, db: AsyncSession, video_id: str, language: str) -> Optional[Transcript]:
+        repo = self._get_repository(db)
+        return await repo.get_by_video_id(video_id=video_id, language=language)
 
-        raise ValueError(f"Could not extract video ID from URL: {url}")
+    async def get_by_url(self, db: AsyncSession, url: str, language: Optional[str] = None) -> Optional[Transcript]:
+        return await self.get_by_video_id(
+            db, extract_video_id(url), language or settings.TRANSCRIPT_DEFAULT_LANGUAGE)
 
-    def _fetch_youtube_url(self, url: str) -> Dict[str, Any]:
+    def _fetch_youtube_url(self, url: str, language: str = "en") -> Dict[str, Any]:
         try:
-            video_id = self._extract_video_id(url)
+            video_id = extract_video_id(url)
 
             ytt_api = YouTubeTranscriptApi()
 
-            transcript_data = ytt_api.fetch(video_id, languages=['en'])
+            transcript_data = ytt_api.fetch(video_id, languages=[language])
+
+            snippets = [
+                {'text': entry.text, 'start': entry.start, 'duration': entry.duration}
+                for entry in transcript_data.snippets
+            ]
 
             transcript_text = " ".join(
                 [entry.text for entry in transcript_data.snippets])
@@ -86,41 +162,310 @@ class TranscriptService(BaseService[Transcript, TranscriptRepository]):
                 duration = last_entry.start + last_entry.duration
 
             language = transcript_data.language_code if hasattr(
-                transcript_data, 'language_code') else 'en'
+                transcript_data, 'language_code') else language
 
             return {
                 'transcript_text': transcript_text,
                 'language': language,
-                'duration': duration
+                'duration': duration,
+                'snippets': snippets
             }
 
         except TranscriptsDisabled:
-            raise ValueError(f"Transcripts are disabled for video: {url}")
+            raise TranscriptUnavailableError(f"Transcripts are disabled for video: {url}")
         except NoTranscriptFound:
-            raise ValueError(f"No transcript found for video: {url}")
+            raise TranscriptUnavailableError(f"No transcript found for video: {url}")
         except VideoUnavailable:
-            raise ValueError(f"Video is unavailable: {url}")
+            raise TranscriptUnavailableError(f"Video is unavailable: {url}")
+        except ValueError:
+            raise
         except Exception as e:
             raise ValueError(f"Error fetching transcript: {str(e)}")
 
-    def get_transcript(self, db: Session, transcript_data: TranscriptCreate) -> Transcript:
-        existing_transcript = self.get_by_url(
-            db, str(transcript_data.video_url))
+    async def get_transcript(self, db: AsyncSession, transcript_data: TranscriptCreate) -> Transcript:
+        # Every URL form of a video maps to the same (video_id, language) row
+        video_id = extract_video_id(str(transcript_data.video_url))
+        language = transcript_data.language or settings.TRANSCRIPT_DEFAULT_LANGUAGE
+
+        existing_transcript = await self.get_by_video_id(db, video_id, language)
         if existing_transcript:
             return existing_transcript
 
-        transcript_info = self._fetch_youtube_url(
-            str(transcript_data.video_url))
+        transcript_id = await self.ingest_video(video_id, language)
+
+        repo = self._get_repository(db)
+        return await repo.get(transcript_id)
+
+    async def ingest_video(self, video_id: str, language: str) -> UUID:
+        # Concurrent requests for the same video share one upstream fetch
+        return await self._ingestions.do(
+            (video_id, language), lambda: self._ingest_transcript(video_id, language))
+
+    async def _ingest_transcript(self, video_id: str, language: str) -> UUID:
+        video_url = canonical_video_url(video_id)
+        transcript_info = await run_in_threadpool(
+            self._fetch_youtube_url, video_url, language)
 
-        transcript = Transcript(
-            video_url=str(transcript_data.video_url),
-            transcript_text=transcript_info['transcript_text'],
-            language=transcript_info['language'],
-            duration=transcript_info['duration']
-        )
+        # Own session: the request that started the fetch may be gone by now
+        async with AsyncSessionLocal() as db:
+            repo = self._get_repository(db)
+            # The row, its segments and its chunks are committed together
+            async with transaction(db):
+                transcript = await repo.insert_if_absent(
+                    video_id=video_id,
+                    video_url=video_url,
+                    transcript_text=transcript_info['transcript_text'],
+                    language=language,
+                    duration=transcript_info['duration']
+                )
+                if transcript is not None:
+                    await repo.add_segments(transcript.transcript_id, transcript_info['snippets'])
+                    await self.ingest_chunks(db, transcript, transcript_info['snippets'])
+
+            if transcript is None:
+                # Stored by another worker in the meantime
+                transcript = await repo.get_by_video_id(video_id, language)
+            return transcript.transcript_id
+
+    def _build_chunks(
+        self,
+        transcript: Transcript,
+        snippets: Optional[List[Dict[str, Any]]] = None
+    ) -> List[TranscriptChunk]:
+        if snippets:
+            chunks = chunk_snippets(snippets, settings.TRANSCRIPT_CHUNK_CHARS)
+        else:
+            chunks = chunk_text(transcript.transcript_text or "", settings.TRANSCRIPT_CHUNK_CHARS)
+
+        return [
+            TranscriptChunk(
+                transcript_id=transcript.transcript_id,
+                chunk_index=idx,
+                start_time=chunk['start'],
+                end_time=chunk['end'],
+                chunk_text=chunk['text']
+            )
+            for idx, chunk in enumerate(chunks)
+        ]
+
+    async def ingest_chunks(
+        self,
+        db: AsyncSession,
+        transcript: Transcript,
+        snippets: Optional[List[Dict[str, Any]]] = None
+    ) -> List[TranscriptChunk]:
+        chunk_objects = self._build_chunks(transcript, snippets)
 
         repo = self._get_repository(db)
-        return repo.create(obj=transcript)
+        async with transaction(db):
+            await repo.add_chunks(chunk_objects)
+        self.index_cache.delete(transcript.transcript_id)
+        return chunk_objects
+
+    async def _fetch_playlist_video_ids(self, playlist_url: str) -> List[str]:
+        playlist_id = extract_playlist_id(playlist_url)
+        limit = settings.TRANSCRIPT_BATCH_MAX_ITEMS
+
+        async with httpx.AsyncClient(timeout=15.0, headers={"Accept-Language": "en"}) as client:
+            try:
+                response = await client.get(
+                    "https://www.youtube.com/playlist", params={"list": playlist_id})
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                raise ValueError(f"Error fetching playlist: {str(e)}")
+
+            page = response.text
+            video_ids = PLAYLIST_VIDEO_ID_PATTERN.findall(page)
+            api_key = INNERTUBE_KEY_PATTERN.search(page)
+            client_version = INNERTUBE_VERSION_PATTERN.search(page)
+
+            # The page only embeds the first 100 videos; the rest are loaded
+            # through the same continuation requests the web client makes
+            continuation = PLAYLIST_CONTINUATION_PATTERN.search(page)
+            while continuation and api_key and client_version and len(video_ids) < limit:
+                try:
+                    response = await client.post(
+                        "https://www.youtube.com/youtubei/v1/browse",
+                        params={"key": api_key.group(1)},
+                        json={
+                            "context": {"client": {"clientName": "WEB", "clientVersion": client_version.group(1)}},
+                            "continuation": continuation.group(1),
+                        }
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    break
+
+                body = response.text
+                video_ids += PLAYLIST_VIDEO_ID_PATTERN.findall(body)
+                continuation = PLAYLIST_CONTINUATION_PATTERN.search(body)
+
+        if not video_ids:
+            raise ValueError(f"No videos found in playlist: {playlist_url}")
+
+        return video_ids[:limit]
+
+    async def ingest_batch(self, db: AsyncSession, batch_data: TranscriptBatchCreate) -> List[Dict[str, Any]]:
+        language = batch_data.language or settings.TRANSCRIPT_DEFAULT_LANGUAGE
+        items = []
+        video_ids = []
+        seen = set()
+
+        urls = [str(url) for url in batch_data.video_urls]
+        if batch_data.playlist_url:
+            urls += [
+                canonical_video_url(video_id)
+                for video_id in await self._fetch_playlist_video_ids(str(batch_data.playlist_url))
+            ]
+
+        if len(urls) > settings.TRANSCRIPT_BATCH_MAX_ITEMS:
+            raise ValueError(f"A batch can contain at most {settings.TRANSCRIPT_BATCH_MAX_ITEMS} videos")
+
+        for url in urls:
+            try:
+                video_id = extract_video_id(url)
+            except ValueError as e:
+                items.append({'video_url': url, 'status': 'invalid', 'detail': str(e)})
+                continue
+
+            if video_id in seen:
+                items.append({'video_url': url, 'video_id': video_id, 'status': 'duplicate'})
+                continue
+            seen.add(video_id)
+            video_ids.append(video_id)
+            items.append({'video_url': url, 'video_id': video_id})
+
+        repo = self._get_repository(db)
+        stored = {t.video_id: t.transcript_id for t in await repo.get_by_video_ids(video_ids, language)}
+        missing = [video_id for video_id in video_ids if video_id not in stored]
+
+        semaphore = asyncio.Semaphore(settings.TRANSCRIPT_FETCH_CONCURRENCY)
+
+        async def fetch(video_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await run_in_threadpool(
+                    self._fetch_youtube_url, canonical_video_url(video_id), language)
+
+        results = await asyncio.gather(*(fetch(video_id) for video_id in missing), return_exceptions=True)
+
+        fetched = {}
+        errors = {}
+        for video_id, result in zip(missing, results):
+            if isinstance(result, Exception):
+                errors[video_id] = str(result)
+            else:
+                fetched[video_id] = result
+
+        created = {}
+        if fetched:
+            # The transcripts, segments and chunks are committed together
+            async with transaction(db):
+                transcripts = await repo.bulk_insert_if_absent([
+                    {
+                        'video_id': video_id,
+                        'video_url': canonical_video_url(video_id),
+                        'transcript_text': info['transcript_text'],
+                        'language': language,
+                        'duration': info['duration']
+                    }
+                    for video_id, info in fetched.items()
+                ])
+
+                chunk_objects = []
+                for transcript in transcripts:
+                    created[transcript.video_id] = transcript.transcript_id
+                    snippets = fetched[transcript.video_id]['snippets']
+                    await repo.add_segments(transcript.transcript_id, snippets)
+                    chunk_objects += self._build_chunks(transcript, snippets)
+                await repo.add_chunks(chunk_objects)
+
+            # Rows that lost a race with another request are already stored
+            raced = [video_id for video_id in fetched if video_id not in created]
+            if raced:
+                stored.update(
+                    {t.video_id: t.transcript_id for t in await repo.get_by_video_ids(raced, language)})
+
+        for item in items:
+            video_id = item.get('video_id')
+            if 'status' in item:
+                continue
+            if video_id in created:
+                item.update(status='created', transcript_id=created[video_id])
+            elif video_id in stored:
+                item.update(status='existing', transcript_id=stored[video_id])
+            else:
+                item.update(status='failed', detail=errors.get(video_id))
+
+        return items
+
+    async def get_segments(
+        self,
+        db: AsyncSession,
+        transcript_id: UUID,
+        start: float = 0.0,
+        end: Optional[float] = None,
+        limit: int = 1000
+    ) -> Optional[List[TranscriptSegment]]:
+        if end is not None and end <= start:
+            raise ValueError("'to' must be after 'from'")
+
+        repo = self._get_repository(db)
+        segments = await repo.get_segments(transcript_id, start, end, limit)
+        if not segments and not await repo.exists(transcript_id):
+            return None
+        return segments
+
+    async def _get_index(self, db: AsyncSession, transcript_id: UUID):
+        entry = self.index_cache.get(transcript_id)
+        if entry is not None:
+            return entry
+
+        repo = self._get_repository(db)
+        chunk_objects = await repo.get_chunks(transcript_id)
+
+        if not chunk_objects:
+            # Transcripts stored before chunking existed are indexed on first use
+            transcript = await repo.get(transcript_id)
+            if not transcript or not transcript.transcript_text:
+                return None
+            chunk_objects = await self.ingest_chunks(db, transcript)
+
+        chunks = [
+            {
+                'text': chunk.chunk_text,
+                'start': chunk.start_time,
+                'end': chunk.end_time
+            }
+            for chunk in chunk_objects
+        ]
+        index = BM25Index([chunk['text'] for chunk in chunks])
+        self.index_cache.set(transcript_id, (index, chunks))
+        return index, chunks
+
+    async def search_chunks(
+        self,
+        db: AsyncSession,
+        transcript_id: UUID,
+        query: str,
+        k: int = None
+    ) -> List[Dict[str, Any]]:
+        k = k or settings.RAG_TOP_K
+
+        entry = await self._get_index(db, transcript_id)
+        if entry is None:
+            return []
+        index, chunks = entry
+
+        hits = index.search(query, k)
+        if hits:
+            selected = sorted(idx for idx, _ in hits)
+        else:
+            # Broad questions ("summarize this") share no terms with the text,
+            # so fall back to chunks spread evenly over the whole video
+            step = max(len(chunks) / k, 1)
+            selected = sorted({int(i * step) for i in range(min(k, len(chunks)))})
+
+        return [chunks[idx] for idx in selected]
 
 
 transcript_service = TranscriptService()
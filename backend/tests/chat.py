@@ -67,8 +67,9 @@ def test_get_user_chats(auth_token, created_chat):
     response = requests.get(f"{BASE_URL}/api/chats/", headers=headers)
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert any(c["chat_id"] == created_chat["chat_id"] for c in data)
+    assert isinstance(data["items"], list)
+    assert any(c["chat_id"] == created_chat["chat_id"] for c in data["items"])
+    assert all("message_count" in c and c["messages"] is None for c in data["items"])
 
 
 def test_get_chat_by_id(auth_token, created_chat):
@@ -98,8 +99,56 @@ def test_get_chat_messages(auth_token, created_chat):
     response = requests.get(f"{BASE_URL}/api/chats/{chat_id}/messages", headers=headers)
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert all("message_id" in msg for msg in data)
+    assert isinstance(data["items"], list)
+    assert all("message_id" in msg for msg in data["items"])
+
+
+def test_get_chat_messages_pages(auth_token, created_chat):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    chat_id = created_chat["chat_id"]
+    for i in range(3):
+        payload = {"sender": "user", "message_text": f"Message {i}", "chat_id": chat_id}
+        requests.post(f"{BASE_URL}/api/chats/{chat_id}/messages", json=payload, headers=headers)
+
+    first = requests.get(f"{BASE_URL}/api/chats/{chat_id}/messages", params={"limit": 2}, headers=headers).json()
+    assert len(first["items"]) == 2
+    assert first["prev_cursor"] is None
+
+    second = requests.get(
+        f"{BASE_URL}/api/chats/{chat_id}/messages",
+        params={"limit": 2, "cursor": first["next_cursor"]},
+        headers=headers
+    ).json()
+    first_ids = {msg["message_id"] for msg in first["items"]}
+    assert all(msg["message_id"] not in first_ids for msg in second["items"])
+
+    back = requests.get(
+        f"{BASE_URL}/api/chats/{chat_id}/messages",
+        params={"limit": 2, "cursor": second["prev_cursor"]},
+        headers=headers
+    ).json()
+    assert back["items"] == first["items"]
+
+
+def test_get_chat_messages_since(auth_token, created_chat):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    chat_id = created_chat["chat_id"]
+    payload = {"sender": "user", "message_text": "Seen message", "chat_id": chat_id}
+    seen = requests.post(f"{BASE_URL}/api/chats/{chat_id}/messages", json=payload, headers=headers).json()
+    payload = {"sender": "user", "message_text": "New message", "chat_id": chat_id}
+    requests.post(f"{BASE_URL}/api/chats/{chat_id}/messages", json=payload, headers=headers)
+
+    response = requests.get(
+        f"{BASE_URL}/api/chats/{chat_id}/messages/since/{seen['message_id']}", headers=headers)
+    assert response.status_code == 200
+    assert [msg["message_text"] for msg in response.json()["items"]] == ["New message"]
+
+    older = requests.get(
+        f"{BASE_URL}/api/chats/{chat_id}/messages",
+        params={"before": seen["message_id"]},
+        headers=headers
+    ).json()
+    assert all(msg["message_id"] != seen["message_id"] for msg in older["items"])
 
 
 def test_send_message_to_llm(auth_token, created_chat):
@@ -111,3 +160,38 @@ def test_send_message_to_llm(auth_token, created_chat):
     data = response.json()
     assert data["chat_id"] == chat_id
     assert "llm_message" in data
+
+    # The question and the answer are stored together, in order
+    response = requests.get(f"{BASE_URL}/api/chats/{chat_id}/messages", headers=headers)
+    last_two = response.json()["items"][-2:]
+    assert [msg["sender"] for msg in last_two] == ["user", "llm"]
+    assert last_two[0]["message_text"] == "Explain this video"
+
+
+def test_stream_message_to_llm(auth_token, created_chat):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    chat_id = created_chat["chat_id"]
+    payload = {"user_message": "Explain this video", "provider": "openai", "chat_id": chat_id}
+    with requests.post(f"{BASE_URL}/api/chats/{chat_id}/llm/stream", json=payload, headers=headers, stream=True) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [line for line in response.iter_lines(decode_unicode=True) if line.startswith("event: ")]
+    assert "event: delta" in events
+    assert events[-1] == "event: done"
+
+    response = requests.get(f"{BASE_URL}/api/chats/{chat_id}/messages", headers=headers)
+    assert response.json()["items"][-1]["sender"] == "llm"
+
+
+def test_semantic_cache_misses_near_miss_questions():
+    from app.services.llm.semantic_cache import SemanticAnswerCache
+
+    cache = SemanticAnswerCache(threshold=0.95)
+    scope = ("transcript", "openai", "gpt-4o")
+    cache.add(scope, "What is the first part of this video about?", "first part")
+    cache.add(scope, "What is this video about?", "whole video")
+
+    assert cache.lookup(scope, "what is the FIRST part of this video about") == "first part"
+    assert cache.lookup(scope, "What is the last part of this video about?") is None
+    assert cache.lookup(scope, "What is the second part of this video about?") is None
+    assert cache.lookup(scope, "What is this video not about?") is None
@@ -1,5 +1,6 @@
 import pytest
 import requests
+import time
 from uuid import UUID
 
 BASE_URL = "http://localhost:8000"
@@ -50,6 +51,87 @@ def test_create_transcript(auth_token):
     UUID(data["transcript_id"])
 
 
+def test_create_transcript_url_variants(auth_token, created_transcript):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for url in [
+        "https://youtu.be/dQw4w9WgXcQ?t=12",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL5-TkQAfAZFbzxjBHtzdVCWE0Zbhomg7r&index=1",
+        "https://m.youtube.com/shorts/dQw4w9WgXcQ",
+    ]:
+        response = requests.post(f"{BASE_URL}/api/transcripts/", json={"video_url": url}, headers=headers)
+        assert response.status_code == 201
+        data = response.json()
+        assert data["transcript_id"] == created_transcript["transcript_id"]
+        assert data["video_id"] == "dQw4w9WgXcQ"
+
+
+def test_create_transcripts_batch(auth_token, created_transcript):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {
+        "video_urls": [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://example.com/not-a-video",
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/api/transcripts/batch", json=payload, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["status"] for item in data["items"]] == ["existing", "duplicate", "invalid"]
+    assert data["items"][0]["transcript_id"] == created_transcript["transcript_id"]
+
+
+def test_transcript_job(auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"video_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}
+    response = requests.post(f"{BASE_URL}/api/transcripts/jobs", json=payload, headers=headers)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["video_id"] == "dQw4w9WgXcQ"
+
+    for _ in range(30):
+        response = requests.get(f"{BASE_URL}/api/transcripts/jobs/{job['job_id']}", headers=headers)
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] in ("succeeded", "failed"):
+            break
+        time.sleep(1)
+
+    assert job["status"] == "succeeded"
+    UUID(job["transcript_id"])
+
+
+@pytest.fixture(scope="session")
+def second_auth_token():
+    user = {"email": "seconduser@example.com", "password": "testpassword123", "name": "Second User"}
+    requests.post(f"{BASE_URL}/api/users/register", json=user)
+    response = requests.post(f"{BASE_URL}/api/users/login", data={"username": user["email"], "password": user["password"]})
+    if response.status_code != 200:
+        pytest.skip("Cannot obtain auth token for a second user")
+    return response.json().get("access_token")
+
+
+def test_shared_transcript_job(auth_token, second_auth_token):
+    # Both users get the same active job and can both poll it
+    payload = {"video_url": "https://www.youtube.com/watch?v=jNQXAC9IVRw"}
+    jobs = []
+    for token in (auth_token, second_auth_token):
+        response = requests.post(f"{BASE_URL}/api/transcripts/jobs", json=payload, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 202
+        jobs.append((token, response.json()))
+
+    for token, job in jobs:
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(30):
+            response = requests.get(f"{BASE_URL}/api/transcripts/jobs/{job['job_id']}", headers=headers)
+            assert response.status_code == 200
+            job = response.json()
+            if job["status"] in ("succeeded", "failed"):
+                break
+            time.sleep(1)
+        assert job["status"] == "succeeded"
+
+
 def test_get_transcript_by_id(auth_token, created_transcript):
     headers = {"Authorization": f"Bearer {auth_token}"}
     transcript_id = created_transcript["transcript_id"]
@@ -59,13 +141,31 @@ def test_get_transcript_by_id(auth_token, created_transcript):
     assert data["transcript_id"] == transcript_id
 
 
+def test_get_transcript_segments(auth_token, created_transcript):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    transcript_id = created_transcript["transcript_id"]
+    response = requests.get(
+        f"{BASE_URL}/api/transcripts/{transcript_id}/segments",
+        params={"from": "0:30", "to": "1:00"},
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["start"] == 30
+    assert data["segments"]
+    for segment in data["segments"]:
+        assert segment["start_time"] < 60
+        assert segment["start_time"] + segment["duration"] > 30
+
+
 def test_get_all_transcripts(auth_token, created_transcript):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = requests.get(f"{BASE_URL}/api/transcripts/", headers=headers)
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert any(t["transcript_id"] == created_transcript["transcript_id"] for t in data)
+    assert isinstance(data["items"], list)
+    assert any(t["transcript_id"] == created_transcript["transcript_id"] for t in data["items"])
+    assert all("transcript_text" not in t for t in data["items"])
 
 
 def test_delete_transcript(auth_token):
@@ -63,6 +63,16 @@ def test_get_current_user(auth_token):
     UUID(data["user_id"])  # валідація UUID
 
 
+def test_get_current_user_stats(auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = requests.get(f"{BASE_URL}/me/stats", headers=headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["chat_count"] >= 0
+    assert data["message_count"] >= 0
+
+
 def test_update_profile(auth_token):
     """Оновлюємо профіль"""
     headers = {"Authorization": f"Bearer {auth_token}"}
@@ -78,6 +88,10 @@ def test_update_profile(auth_token):
     data = response.json()
     assert data["name"] == "Updated Test User"
 
+    # The cached user snapshot is invalidated by the update
+    response = requests.get(f"{BASE_URL}/me", headers=headers)
+    assert response.json()["name"] == "Updated Test User"
+
 
 # def test_delete_profile(auth_token):
 #     """Видаляємо користувача"""